@@ -0,0 +1,49 @@
+"""
+An activity scheduler built on priority queues: tasks with priorities, durations and dependencies
+are turned into a step-by-step schedule
+
+    from activity_scheduler import Task, TaskScheduler
+    TaskScheduler([Task(0, 1, 'Find a cafe to study', 10, [])]).run_task_scheduler(starting_time=480)
+
+Importing the package only loads the scheduler itself; the executors (asyncio and process pools),
+the schedule cache, the schedule sinks and the NumPy simulation are imported the first time they are used
+"""
+
+import importlib
+
+from .heaps import BucketQueue, IndexedMinHeap, MinHeap
+from .stats import SchedulerHook, SchedulerStats
+from .task import CriticalPathAnalysis, ScheduleEvent, Task, ValidationReport
+from .table import StringTable, TaskTable
+from .scheduler import TaskScheduler
+
+# attributes whose modules are only imported on first use, and the module each one lives in
+LAZY_ATTRIBUTES = {
+    "AsyncTaskScheduler": "executors",
+    "ProcessTaskScheduler": "executors",
+    "run_task_batch": "executors",
+    "ScheduleCache": "cache",
+    "simulate": "simulation",
+    "SimulationResult": "simulation",
+    "ScheduleSink": "sinks",
+    "JsonLinesScheduleSink": "sinks",
+    "CsvScheduleSink": "sinks",
+    "BinaryScheduleSink": "sinks",
+}
+
+__all__ = [
+    "BucketQueue", "IndexedMinHeap", "MinHeap",
+    "SchedulerHook", "SchedulerStats",
+    "CriticalPathAnalysis", "ScheduleEvent", "Task", "ValidationReport",
+    "StringTable", "TaskTable",
+    "TaskScheduler",
+    *LAZY_ATTRIBUTES,
+]
+
+
+def __getattr__(name):
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{LAZY_ATTRIBUTES[name]}", __name__), name)
+    globals()[name] = value
+    return value
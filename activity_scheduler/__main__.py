@@ -0,0 +1,79 @@
+"""
+Schedules a task file from the command line
+
+    python -m activity_scheduler tasks.csv --mode dependency --start 480
+    python -m activity_scheduler --demo
+
+Task files are CSV or JSON Lines feeds (see TaskTable.from_csv and TaskTable.from_jsonl) or
+task files written by TaskTable.write; the format is taken from the extension unless --format is given.
+The plan is validated first: cycles, duplicate ids and dependencies on unknown ids exit with status 2
+"""
+
+import argparse
+import sys
+
+from .scheduler import TaskScheduler
+from .table import TaskTable
+
+# file extensions of the task file formats
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".task": "task"}
+
+
+def load_tasks(path, file_format = None, id_type = int):
+    """
+    Input: path of a task file, its format (csv, jsonl or task; None takes it from the extension) and the id type
+    Output: a TaskTable
+    """
+    if file_format is None:
+        extension = path[path.rfind("."):].lower() if "." in path else ""
+        if extension not in FORMATS:
+            raise ValueError(f"cannot tell the format of {path!r}; pass --format")
+        file_format = FORMATS[extension]
+    if file_format == "task":
+        return TaskTable.open(path)
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            return TaskTable.from_csv(file, id_type)
+        return TaskTable.from_jsonl(file, id_type)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog = "python -m activity_scheduler",
+                                     description = "Print the schedule of a task file")
+    parser.add_argument("file", nargs = "?", help = "CSV, JSON Lines or binary task file")
+    parser.add_argument("--format", choices = sorted(set(FORMATS.values())), help = "format of the task file")
+    parser.add_argument("--string-ids", action = "store_true", help = "keep the task ids as strings")
+    parser.add_argument("--mode", choices = TaskScheduler.MODES, default = TaskScheduler.DEPENDENCY_ORDER)
+    parser.add_argument("--start", type = int, default = 480, help = "starting time in minutes after midnight")
+    parser.add_argument("--workers", type = int, default = 1, help = "number of lanes run side by side")
+    parser.add_argument("--demo", action = "store_true", help = "print the schedules of the example plans")
+    args = parser.parse_args(argv)
+    
+    if args.demo:
+        from .demos import run_demos
+        run_demos()
+        return 0
+    if args.file is None:
+        parser.error("a task file or --demo is needed")
+    
+    try:
+        tasks = load_tasks(args.file, args.format, str if args.string_ids else int)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file = sys.stderr)
+        return 2
+    # a plan with cycles or dependencies on unknown ids would run with those tasks blocked or unconstrained
+    report = TaskScheduler(tasks).validate()
+    if not report.is_valid:
+        for message in report.errors():
+            print(f"error: {message}", file = sys.stderr)
+        return 2
+    # the columnar engine covers the serial priority and dependency modes; the rest need Task objects
+    if args.mode not in (TaskScheduler.PRIORITY_ORDER, TaskScheduler.DEPENDENCY_ORDER) or args.workers > 1:
+        tasks = [tasks.task(row) for row in range(len(tasks))]
+    scheduler = TaskScheduler(tasks)
+    scheduler.run_task_scheduler(starting_time = args.start, mode = args.mode, workers = args.workers)
+    return 1 if scheduler.blocked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+A content-addressed cache of computed schedules
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import sys
+from collections import OrderedDict
+
+from .scheduler import TaskScheduler
+from .table import TaskTable
+from .task import ScheduleEvent
+
+
+class ScheduleCache:
+    """
+    A content-addressed cache of computed schedules: a schedule is stored under a hash of everything it
+    depends on (the tasks in list order with their ids, priorities, descriptions, durations, dependencies,
+    multitask ids and statuses, the starting time, the mode and the lanes), so a plan submitted again is
+    answered with the stored events instead of being scheduled again
+    Input:
+    - max_bytes: memory budget of the in-memory tier, counting the events and the ids, descriptions and
+      times they hold (see size); the least recently used schedules are evicted past it
+    - directory: optional directory of the on-disk tier; every schedule is also written there as JSON and
+      schedules evicted from memory are read back from it
+    """
+    # initialization
+    def __init__(self, max_bytes = 64 * 2**20, directory = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        
+        # key -> (events, blocked, makespan, busy_time, utilisation, size in bytes), least recently used first
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+    def key(self, tasks, starting_time = 480, mode = TaskScheduler.PRIORITY_ORDER, workers = 1, multitask = False):
+        """
+        Hashes a plan canonically; the list order is part of the plan since it breaks ties between equal priorities
+        Input: a list of tasks or a TaskTable and the arguments of iter_schedule
+        Output: the key as a hex string
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((starting_time, mode, workers, bool(multitask))).encode("utf-8"))
+        if isinstance(tasks, TaskTable):
+            # the typed columns are hashed as they are laid out in memory, the narrowed ones as 64-bit
+            # integers so a table and the task file it was written to share their key
+            digest.update(b"table")
+            for column in (tasks.priorities, tasks.durations, tasks.dependency_offsets, tasks.dependency_rows):
+                digest.update(TaskTable.wide_column(column))
+            digest.update(tasks.statuses)
+            digest.update(repr(list(tasks.ids)).encode("utf-8"))
+            digest.update(repr(list(tasks.descriptions)).encode("utf-8"))
+        else:
+            for task in tasks:
+                digest.update(repr((task.id, task.priority, task.description, task.duration, list(task.dependencies),
+                                    list(task.multitask), task.status)).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def schedule(self, scheduler, starting_time = 480, mode = TaskScheduler.PRIORITY_ORDER, workers = 1, multitask = False):
+        """
+        Computes the schedule of a scheduler's tasks through the cache; on a hit the tasks are marked as
+        completed and the scheduler's blocked, makespan, busy_time and utilisation are filled in from the
+        cache, just as scheduling would
+        Input: a TaskScheduler and the arguments of iter_schedule
+        Output: the ScheduleEvent records as a tuple
+        """
+        key = self.key(scheduler.tasks, starting_time, mode, workers, multitask)
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            events = tuple(scheduler.iter_schedule(starting_time, mode, workers, multitask))
+            self.put(key, (events, list(scheduler.blocked), scheduler.makespan, scheduler.busy_time, scheduler.utilisation))
+            return events
+        
+        events, blocked, makespan, busy_time, utilisation = entry[:5]
+        for event in events:
+            if event.kind == TaskScheduler.TASK_COMPLETED:
+                if isinstance(scheduler.tasks, TaskTable):
+                    scheduler.tasks.statuses[scheduler.tasks.row(event.task_id)] = TaskTable.COMPLETED
+                else:
+                    scheduler.set_status(scheduler.tasks_by_id[event.task_id], TaskScheduler.COMPLETED)
+        if isinstance(scheduler.tasks, TaskTable):
+            scheduler.rebuild_status_index()
+        scheduler.blocked = list(blocked)
+        scheduler.makespan = makespan
+        scheduler.busy_time = busy_time
+        scheduler.utilisation = utilisation
+        return events
+    
+    def get(self, key):
+        """
+        Looks a schedule up in memory, then on disk
+        Input: a key
+        Output: the entry, or None when the schedule is not cached
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return None
+        entry = (tuple(ScheduleEvent(*event) for event in stored["events"]), stored["blocked"],
+                 stored["makespan"], stored["busy_time"], stored["utilisation"])
+        self.disk_hits += 1
+        return self.remember(key, entry)
+    
+    def put(self, key, entry):
+        """
+        Stores a schedule in memory and, with a directory, on disk
+        Input: a key and the (events, blocked, makespan, busy_time, utilisation) entry
+        """
+        self.remember(key, entry)
+        if self.directory is not None:
+            events, blocked, makespan, busy_time, utilisation = entry[:5]
+            path = self.path(key)
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump({"events": [list(event) for event in events], "blocked": blocked, "makespan": makespan,
+                           "busy_time": busy_time, "utilisation": utilisation}, file)
+            os.replace(path + ".tmp", path)
+    
+    def remember(self, key, entry):
+        """
+        Adds an entry to the in-memory tier and evicts the least recently used entries past max_bytes;
+        an entry larger than the whole budget is not kept in memory
+        Output: the entry with its size
+        """
+        size = self.size(entry)
+        entry = tuple(entry[:5]) + (size,)
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[5]
+        if size <= self.max_bytes:
+            self.entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self.bytes -= self.entries.popitem(last=False)[1][5]
+        return entry
+    
+    def size(self, entry):
+        """
+        Measures the memory an entry keeps alive: the events tuple, every event and every object the events
+        and the blocked list hold (ids, descriptions, times), each object counted once however many events
+        share it, like the descriptions of a task's two events or the kind strings
+        Input: an (events, blocked, ...) entry
+        Output: its size in bytes
+        """
+        events, blocked = entry[0], entry[1]
+        size = sys.getsizeof(events) + sys.getsizeof(blocked) + sum(sys.getsizeof(event) for event in events)
+        # the entry keeps every value alive, so their identities stay unique while they are counted
+        seen = set()
+        for value in itertools.chain(itertools.chain.from_iterable(events), blocked):
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += sys.getsizeof(value)
+        return size
+    
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+    
+    def clear(self):
+        """
+        Empties the in-memory tier; the on-disk tier is left as it is
+        """
+        self.entries.clear()
+        self.bytes = 0
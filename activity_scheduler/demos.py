@@ -0,0 +1,71 @@
+"""
+The example plans of the assignment, run by python -m activity_scheduler --demo
+"""
+
+from .scheduler import TaskScheduler
+from .task import Task
+
+
+def study_day_tasks():
+    """
+    Output: a day of studying, cooking, buying a gift and getting to a cafe, with dependencies
+    """
+    return [
+        Task(0, 7, 'Complete readings', 40, []), 
+        Task(1, 8, 'Answer study guide questions', 20, [0]), 
+        Task(2, 9, 'Do pre-class work', 30, [0, 1]), 
+        Task(3, 13, 'Buy noodles and tofu', 40, []), 
+        Task(4, 13, 'Cook raw noodles and tofu', 15, [3]), 
+        Task(5, 13, 'Add noodles to fried tofu', 20, [3, 4]), 
+        Task(6, 4, 'Find a gift store', 10, []), 
+        Task(7, 5, 'Choose a gift', 20, [6]), 
+        Task(8, 6, 'Pay for the item', 5, [6, 7]), 
+        Task(9, 1, 'Find a cafe to study', 10, []), 
+        Task(10, 2, 'Put my technology into the bag', 5, [9]), 
+        Task(11, 3, 'Take a bus to a cafe', 10, [9, 10]),
+        Task(12, 10, 'Message my friend', 5, []), 
+        Task(13, 11, 'Charge my phone', 5, []), 
+        Task(14, 12, 'Save the location of the village', 5, [])]
+
+
+def priority_example_tasks():
+    """
+    Output: a few independent tasks, to show that they run by priority value
+    """
+    return [
+        Task(0, 4, 'Read Sapiens', 30, []), 
+        Task(1, 3, 'Do yoga', 30, []), 
+        Task(2, 1, 'Schedule a doctor appointment', 5, []), 
+        Task(3, 2, 'Hug my roommate', 3, [])]
+
+
+def multitask_day_tasks():
+    """
+    Output: the study day with the ids of the tasks each task can be done alongside
+    """
+    return [
+        Task(0, 7, 'Complete readings', 40, [9], []), 
+        Task(1, 8, 'Answer study guide questions', 20, [0], []), 
+        Task(2, 9, 'Do pre-class work', 30, [0, 1, 9], []), 
+        Task(3, 13, 'Buy noodles and tofu', 40, [], []), 
+        Task(4, 13, 'Cook raw noodles and tofu', 15, [3], [9, 10, 12, 13, 14]), 
+        Task(5, 13, 'Add noodles to fried tofu', 20, [3, 4], []), 
+        Task(6, 4, 'Find a gift store', 10, [], []), 
+        Task(7, 5, 'Choose a gift', 20, [6], [12, 14, 1]), 
+        Task(8, 6, 'Pay for the item', 5, [6], []), 
+        Task(9, 1, 'Find a cafe to study', 10, [], []), 
+        Task(10, 2, 'Put my technology into the bag', 5, [9], []), 
+        Task(11, 3, 'Take a bus to a cafe', 10, [9, 2, 10], [4, 9, 12, 14]),
+        Task(12, 10, 'Message my friend', 5, [9], []), 
+        Task(13, 11, 'Charge my phone', 5, [9], []), 
+        Task(14, 12, 'Save the location of the village', 5, [], [])]
+
+
+def run_demos():
+    """
+    Prints the schedules of the three example plans
+    """
+    TaskScheduler(study_day_tasks()).run_task_scheduler(starting_time=480, mode=TaskScheduler.DEPENDENCY_ORDER)
+    TaskScheduler(priority_example_tasks()).run_task_scheduler(starting_time=480)
+    TaskScheduler(multitask_day_tasks()).run_task_scheduler(starting_time=480, mode=TaskScheduler.DEPENDENCY_ORDER,
+                                                            workers=2, multitask=True)
@@ -0,0 +1,268 @@
+"""
+Executors that run real work in schedule order: coroutines with asyncio and callables in a process pool
+"""
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter
+
+from .scheduler import TaskScheduler
+
+
+class AsyncTaskScheduler(TaskScheduler):
+    """
+    Runs real work instead of printing a simulated timeline: every task has a coroutine function,
+    ready tasks are started in priority order up to a concurrency limit, and a task is started only
+    once all its dependencies finished. A task that fails or is cancelled cancels every task that
+    depends on it, directly or through other tasks
+    Input:
+    - tasks: a list of tasks
+    - coroutines: a dictionary from a task id to a coroutine function, or one coroutine function
+      for every task; it is called with the task and its return value is kept in results
+    - concurrency: the most coroutines running at once
+    - queue_backend: the ready queue class, as for TaskScheduler
+    """
+    # initialization
+    def __init__(self, tasks, coroutines, concurrency = 100, queue_backend = None):
+        super().__init__(tasks, queue_backend)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.coroutines = coroutines
+        self.concurrency = concurrency
+        
+        # return values of the completed tasks and exceptions of the failed ones, by task id
+        self.results = {}
+        self.errors = {}
+        
+    def coroutine_function(self, task):
+        """
+        Input: a task
+        Output: the coroutine function that runs it
+        """
+        if callable(self.coroutines):
+            return self.coroutines
+        return self.coroutines[task.id]
+    
+    async def run(self, mode = TaskScheduler.DEPENDENCY_ORDER, fail_fast = False):
+        """
+        Runs the coroutines of the tasks; cancelling run cancels the coroutines still running
+        Input: the scheduling mode (see build_priority_queue) and fail_fast, which stops the run
+        and raises the exception of the first task that fails
+        Output: a dictionary from the id of every completed task to its coroutine's return value;
+        failed tasks are in errors and the tasks left blocked by a cycle in blocked
+        """
+        self.build_priority_queue(mode)
+        
+        # running asyncio tasks and the start number and task of each of them
+        running = set()
+        owners = {}
+        started = itertools.count()
+        try:
+            while self.priority_queue.size != 0 or running:
+                
+                # start ready tasks in priority order while there is room
+                while self.priority_queue.size != 0 and len(running) < self.concurrency:
+                    priority, sequence, task = self.priority_queue.remove()
+                    self.set_status(task, self.IN_PROGRESS)
+                    job = asyncio.ensure_future(self.coroutine_function(task)(task))
+                    owners[job] = (next(started), task)
+                    running.add(job)
+                
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                
+                # handle the finished tasks in the order they were started so runs are repeatable;
+                # with fail_fast every finished task is recorded before the first failure is raised
+                failure = None
+                for job in sorted(done, key=lambda job: owners[job][0]):
+                    task = owners.pop(job)[1]
+                    if job.cancelled():
+                        self.set_status(task, self.CANCELLED)
+                        self.cancel_dependents(task.id)
+                    elif job.exception() is not None:
+                        self.set_status(task, self.FAILED)
+                        self.errors[task.id] = job.exception()
+                        self.cancel_dependents(task.id)
+                        if fail_fast and failure is None:
+                            failure = job.exception()
+                    else:
+                        self.results[task.id] = job.result()
+                        self.complete_task(task)
+                if failure is not None:
+                    raise failure
+        finally:
+            # on failure or cancellation of run, cancel and wait for the coroutines still running
+            for job in running:
+                job.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            for job in running:
+                task = owners.pop(job)[1]
+                self.set_status(task, self.CANCELLED)
+                self.cancel_dependents(task.id)
+            self.priority_queue = None
+        
+        self.blocked = self.find_blocked()
+        return self.results
+
+
+def run_task_batch(batch):
+    """
+    Runs a batch of task callables in a worker process; a batch is sent and answered with one
+    message each way instead of one per task
+    Input: list of (task id, callable) pairs; each callable is called with its task id
+    Output: list of (task id, succeeded, return value or exception, measured seconds)
+    """
+    results = []
+    for task_id, function in batch:
+        started = perf_counter()
+        try:
+            value = function(task_id)
+        except Exception as error:
+            results.append((task_id, False, error, perf_counter() - started))
+        else:
+            results.append((task_id, True, value, perf_counter() - started))
+    return results
+
+
+class ProcessTaskScheduler(TaskScheduler):
+    """
+    Runs CPU-bound task callables in a pool of worker processes: ready tasks are dispatched in priority
+    order in batches, every worker is kept busy while the dependencies allow, and a task is dispatched
+    only once all its dependencies completed. A task that fails cancels every task that depends on it
+    Input:
+    - tasks: a list of tasks
+    - functions: a dictionary from a task id to a picklable callable, or one callable for every task;
+      it is called with the task id and its return value is kept in results
+    - workers: number of worker processes, os.cpu_count() when None
+    - executor: a concurrent.futures executor to use instead of a new ProcessPoolExecutor
+    - batch_size: the most tasks sent to a worker in one message
+    - queue_backend: the ready queue class, as for TaskScheduler
+    """
+    # initialization
+    def __init__(self, tasks, functions, workers = None, executor = None, batch_size = 64, queue_backend = None):
+        super().__init__(tasks, queue_backend)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.functions = functions
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.batch_size = batch_size
+        
+        # return values of the completed tasks, exceptions of the failed ones and the measured
+        # run time in seconds of both, by task id
+        self.results = {}
+        self.errors = {}
+        self.measured = {}
+        
+    def function(self, task):
+        """
+        Input: a task
+        Output: the callable that runs it
+        """
+        if callable(self.functions):
+            return self.functions
+        return self.functions[task.id]
+    
+    def next_batch(self, in_flight):
+        """
+        Takes the next batch of ready tasks off the queue in priority order; the ready tasks are spread
+        over the idle workers so a wide graph keeps them all busy
+        Input: number of batches already running
+        Output: list of (task id, callable) pairs
+        """
+        idle = max(1, self.workers - in_flight)
+        size = min(self.batch_size, max(1, self.priority_queue.size // idle))
+        batch = []
+        while len(batch) < size and self.priority_queue.size != 0:
+            priority, sequence, task = self.priority_queue.remove()
+            self.set_status(task, self.IN_PROGRESS)
+            batch.append((task.id, self.function(task)))
+        return batch
+    
+    def record_batch(self, future, batch):
+        """
+        Records the outcome of every task of a finished batch: completed tasks release their dependents,
+        failed ones cancel theirs
+        Input: the future of the batch and its (task id, callable) pairs
+        Output: the exception of the first task of the batch that failed, or None
+        """
+        if future.exception() is not None:
+            # the batch never ran, e.g. its callables could not be pickled or a worker died
+            outcomes = [(task_id, False, future.exception(), 0.0) for task_id, function in batch]
+        else:
+            outcomes = future.result()
+        failure = None
+        for task_id, succeeded, value, seconds in outcomes:
+            task = self.tasks_by_id[task_id]
+            self.measured[task_id] = seconds
+            if succeeded:
+                self.results[task_id] = value
+                self.complete_task(task)
+            else:
+                self.set_status(task, self.FAILED)
+                self.errors[task_id] = value
+                self.cancel_dependents(task_id)
+                if failure is None:
+                    failure = value
+        return failure
+    
+    def run(self, mode = TaskScheduler.DEPENDENCY_ORDER, fail_fast = False):
+        """
+        Runs the callables of the tasks in the worker processes
+        Input: the scheduling mode (see build_priority_queue) and fail_fast, which stops dispatching
+        and raises the exception of the first task that fails
+        Output: a dictionary from the id of every completed task to its callable's return value;
+        failed tasks are in errors and the tasks left blocked by a cycle in blocked
+        """
+        self.build_priority_queue(mode)
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        running = {}
+        started = itertools.count()
+        try:
+            while self.priority_queue.size != 0 or running:
+                
+                # hand batches to the workers in priority order while a worker is idle
+                while self.priority_queue.size != 0 and len(running) < self.workers:
+                    batch = self.next_batch(len(running))
+                    running[executor.submit(run_task_batch, batch)] = (next(started), batch)
+                
+                done = wait(running, return_when=FIRST_COMPLETED)[0]
+                
+                # handle the finished batches in the order they were dispatched so runs are repeatable;
+                # with fail_fast every outcome at hand is recorded before the first failure is raised
+                failure = None
+                for future in sorted(done, key=lambda future: running[future][0]):
+                    error = self.record_batch(future, running.pop(future)[1])
+                    if fail_fast and failure is None:
+                        failure = error
+                if failure is not None:
+                    raise failure
+        finally:
+            # batches still running when dispatching stopped: the ones a worker has not picked up are
+            # cancelled, the others are waited for and recorded like any other, since their tasks did run
+            for future in running:
+                future.cancel()
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+            else:
+                wait(running)
+            for future, (number, batch) in sorted(running.items(), key=lambda item: item[1][0]):
+                if future.cancelled():
+                    for task_id, function in batch:
+                        self.set_status(self.tasks_by_id[task_id], self.CANCELLED)
+                        self.cancel_dependents(task_id)
+                else:
+                    self.record_batch(future, batch)
+            self.priority_queue = None
+        
+        self.blocked = self.find_blocked()
+        return self.results
+    
+    def duration_report(self):
+        """
+        Compares the measured run time of the tasks with their declared durations
+        Output: list of (task id, declared duration in minutes, measured seconds) in dispatch order
+        """
+        return [(task_id, self.tasks_by_id[task_id].duration, seconds) for task_id, seconds in self.measured.items()]
@@ -0,0 +1,538 @@
+"""
+Priority queues used by the scheduler: a min heap, a min heap indexed by task id and a bucket queue
+"""
+
+#import sys module to acess variables used or maintained by the interpreter
+import sys
+from bisect import insort
+from collections import deque
+
+
+class MinHeap:
+    """
+    A class with methods to create a min heap, push a new element and pop the root
+    Input: initial capacity of the heap; the heap doubles its capacity whenever it is full
+    """
+    # initialization
+    def __init__(self, maxsize = 16):
+        self.maxsize = max(maxsize, 1)
+        self.size = 0
+        self.Heap = [0]*(self.maxsize + 1)
+        self.Heap[0] = -1 * sys.maxsize
+        self.FRONT = 1
+        # a SchedulerStats to count operations in, None when not instrumented
+        self.stats = None
+ 
+    @classmethod
+    def from_iterable(cls, elements):
+        """
+        Builds a heap from all the elements at once in linear time
+        Input: an iterable of elements
+        Output: a min heap holding the elements
+        """
+        elements = list(elements)
+        heap = cls(len(elements))
+        heap.Heap[1:len(elements) + 1] = elements
+        heap.size = len(elements)
+        heap.minHeap()
+        return heap
+ 
+    def __len__(self):
+        return self.size
+ 
+    def __iter__(self):
+        """
+        Output: an iterator over the elements in heap order, not sorted
+        """
+        return iter(self.Heap[self.FRONT:self.size + 1])
+ 
+    def parent(self, pos):
+        """
+        Input: position of the node
+        Output: the position of parent at pos
+        """
+        return pos // 2
+ 
+    def leftChild(self, pos):
+        """
+        Input: position of the node
+        Output: position of the left child
+        """       
+        return 2 * pos
+ 
+    def rightChild(self, pos):
+        """
+        Input: position of the node
+        Output: position of the right child
+        """   
+        return (2 * pos) + 1
+ 
+    def isLeaf(self, pos):
+        """
+        Input: position of the node
+        Output: returns true if the passed node is a leaf node (or lies past the end of the heap)
+        """   
+        if pos > (self.size // 2):
+            return True
+        return False
+ 
+    def swap(self, fpos, spos):
+        """
+        Swaps two nodes
+        Input: position of two node
+        """ 
+        self.Heap[fpos], self.Heap[spos] = self.Heap[spos], self.Heap[fpos]
+ 
+    def grow(self):
+        """
+        Doubles the capacity of the heap so that inserts stay amortized O(1) in copying
+        """
+        # a heap built from no elements has no capacity to double
+        added = max(self.maxsize, 1)
+        self.Heap.extend([0] * added)
+        self.maxsize += added
+ 
+    def minHeapify(self, pos):
+        """
+        A function that heapifies the node at pos
+        Input: position of the node
+        """ 
+        # sift the node down iteratively: children move up into the hole until the
+        # node fits, so there is one write per level and no recursion
+        heap = self.Heap
+        size = self.size
+        start = pos
+        element = heap[pos]
+        child = 2 * pos
+        while child <= size:
+            # pick the smaller child; the right child may not exist
+            if child < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < element:
+                break
+            heap[pos] = heap[child]
+            pos = child
+            child = 2 * pos
+        heap[pos] = element
+        if self.stats is not None:
+            self.stats.record_sift(start, pos)
+ 
+    def insert(self, element):
+        """
+        A function that inserts an element into the heap
+        Input: the element to insert
+        """ 
+        if self.size >= self.maxsize :
+            self.grow()
+        self.size+= 1
+        heap = self.Heap
+ 
+        # sift the element up; stop at the root so entries never get compared with the sentinel
+        current = self.size
+        while current > 1:
+            parent = current // 2
+            if not element < heap[parent]:
+                break
+            heap[current] = heap[parent]
+            current = parent
+        heap[current] = element
+        if self.stats is not None:
+            self.stats.inserts += 1
+            self.stats.record_sift(self.size, current)
+  
+    def minHeap(self):
+        """
+        A function that builds the min heap
+        """ 
+ 
+        for pos in range(self.size//2, 0, -1):
+            self.minHeapify(pos)
+ 
+    def remove(self):
+        """
+        A function that removes and pops the root element
+        Output: the root of the heap
+        """ 
+        if self.size == 0:
+            raise IndexError("remove from an empty heap")
+        if self.stats is not None:
+            self.stats.removes += 1
+        popped = self.Heap[self.FRONT]
+        self.Heap[self.FRONT] = self.Heap[self.size]
+        # clear the vacated slot so the heap does not keep popped entries alive
+        self.Heap[self.size] = 0
+        self.size-= 1
+        if self.size:
+            self.minHeapify(self.FRONT)
+        return popped
+ 
+    def pushpop(self, element):
+        """
+        Pushes an element and then pops the root, faster than insert followed by remove
+        Input: the element to push
+        Output: the smallest of the element and the root of the heap
+        """
+        if self.size and self.Heap[self.FRONT] < element:
+            element, self.Heap[self.FRONT] = self.Heap[self.FRONT], element
+            self.minHeapify(self.FRONT)
+        return element
+ 
+    def replace(self, element):
+        """
+        Pops the root and then pushes an element, keeping the size of the heap unchanged
+        Input: the element to push
+        Output: the root of the heap before the element was pushed
+        """
+        if self.size == 0:
+            raise IndexError("replace on an empty heap")
+        popped = self.Heap[self.FRONT]
+        self.Heap[self.FRONT] = element
+        self.minHeapify(self.FRONT)
+        return popped
+
+
+class IndexedMinHeap(MinHeap):
+    """
+    A min heap of (priority, sequence, task) entries that also maps every task id to its position,
+    so a queued task can be found, reprioritised or cancelled in O(log n) without rebuilding the heap
+    Input: initial capacity of the heap
+    """
+    # initialization
+    def __init__(self, maxsize = 16):
+        super().__init__(maxsize)
+        self.positions = {}
+ 
+    def __contains__(self, task_id):
+        return task_id in self.positions
+ 
+    def contains(self, task_id):
+        """
+        Input: id of a task
+        Output: returns true if the task is in the heap
+        """
+        return task_id in self.positions
+ 
+    def siftUp(self, pos):
+        """
+        Moves the entry at pos up until its parent is smaller, keeping the position map current
+        Input: position of the node
+        """
+        heap = self.Heap
+        positions = self.positions
+        start = pos
+        element = heap[pos]
+        while pos > 1:
+            parent = pos // 2
+            if not element < heap[parent]:
+                break
+            heap[pos] = heap[parent]
+            positions[heap[pos][2].id] = pos
+            pos = parent
+        heap[pos] = element
+        positions[element[2].id] = pos
+        if self.stats is not None:
+            self.stats.record_sift(start, pos)
+ 
+    def minHeapify(self, pos):
+        """
+        A function that heapifies the node at pos, keeping the position map current
+        Input: position of the node
+        """
+        heap = self.Heap
+        positions = self.positions
+        size = self.size
+        start = pos
+        element = heap[pos]
+        child = 2 * pos
+        while child <= size:
+            if child < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < element:
+                break
+            heap[pos] = heap[child]
+            positions[heap[pos][2].id] = pos
+            pos = child
+            child = 2 * pos
+        heap[pos] = element
+        positions[element[2].id] = pos
+        if self.stats is not None:
+            self.stats.record_sift(start, pos)
+ 
+    def minHeap(self):
+        """
+        A function that builds the min heap and its position map
+        """
+        self.positions = {}
+        super().minHeap()
+        for pos in range(1, self.size + 1):
+            self.positions[self.Heap[pos][2].id] = pos
+ 
+    def insert(self, element):
+        """
+        A function that inserts an entry into the heap
+        Input: a (priority, sequence, task) entry whose task is not in the heap yet
+        """
+        if element[2].id in self.positions:
+            raise ValueError(f"task {element[2].id} is already in the heap")
+        if self.size >= self.maxsize:
+            self.grow()
+        self.size += 1
+        self.Heap[self.size] = element
+        if self.stats is not None:
+            self.stats.inserts += 1
+        self.siftUp(self.size)
+ 
+    def removeAt(self, pos):
+        """
+        Removes the entry at pos by moving the last entry into its place
+        Input: position of the node
+        Output: the removed entry
+        """
+        if self.stats is not None:
+            self.stats.removes += 1
+        heap = self.Heap
+        removed = heap[pos]
+        del self.positions[removed[2].id]
+        last = heap[self.size]
+        heap[self.size] = 0
+        self.size -= 1
+        if pos <= self.size:
+            heap[pos] = last
+            if last < removed:
+                self.siftUp(pos)
+            else:
+                self.minHeapify(pos)
+        return removed
+ 
+    def remove(self):
+        """
+        A function that removes and pops the root entry
+        Output: the root of the heap
+        """
+        if self.size == 0:
+            raise IndexError("remove from an empty heap")
+        return self.removeAt(self.FRONT)
+ 
+    def pushpop(self, element):
+        """
+        Pushes an entry and then pops the root, faster than insert followed by remove
+        Input: a (priority, sequence, task) entry
+        Output: the smallest of the entry and the root of the heap
+        """
+        if self.size and self.Heap[self.FRONT] < element:
+            if element[2].id in self.positions:
+                raise ValueError(f"task {element[2].id} is already in the heap")
+            popped = self.Heap[self.FRONT]
+            del self.positions[popped[2].id]
+            self.Heap[self.FRONT] = element
+            self.minHeapify(self.FRONT)
+            return popped
+        return element
+ 
+    def replace(self, element):
+        """
+        Pops the root and then pushes an entry, keeping the size of the heap unchanged
+        Input: a (priority, sequence, task) entry
+        Output: the root of the heap before the entry was pushed
+        """
+        if self.size == 0:
+            raise IndexError("replace on an empty heap")
+        popped = self.Heap[self.FRONT]
+        if element[2].id in self.positions and element[2].id != popped[2].id:
+            raise ValueError(f"task {element[2].id} is already in the heap")
+        del self.positions[popped[2].id]
+        self.Heap[self.FRONT] = element
+        self.minHeapify(self.FRONT)
+        return popped
+ 
+    def update_priority(self, task_id, priority):
+        """
+        Changes the priority of a queued task and restores the heap order (decrease- or increase-key)
+        Input: id of the task and its new priority
+        """
+        pos = self.positions[task_id]
+        old = self.Heap[pos]
+        new = (priority, old[1], old[2])
+        self.Heap[pos] = new
+        if new < old:
+            self.siftUp(pos)
+        else:
+            self.minHeapify(pos)
+ 
+    def entry(self, task_id):
+        """
+        Input: id of a queued task
+        Output: its (priority, sequence, task) entry, which stays in the heap
+        """
+        return self.Heap[self.positions[task_id]]
+    
+    def cancel(self, task_id):
+        """
+        Removes a queued task from the heap
+        Input: id of the task
+        Output: the removed (priority, sequence, task) entry
+        """
+        return self.removeAt(self.positions[task_id])
+
+
+class BucketQueue:
+    """
+    A bucket (radix) priority queue of (priority, sequence, task) entries for small integer priorities:
+    one FIFO per priority level and a cursor to the lowest bucket that may hold an entry,
+    so insert is O(1) and remove is amortized O(1). Entries with equal priorities leave in sequence order,
+    as in a heap, so both give the same order
+    Input: lowest and highest priority expected; buckets are added when other priorities show up,
+    up to MAX_RANGE buckets in all
+    """
+    # the most priority levels a queue holds; see accepts
+    MAX_RANGE = 1024
+    
+    # initialization
+    def __init__(self, lowest = 0, highest = 0):
+        if highest - lowest >= self.MAX_RANGE:
+            raise ValueError(f"a bucket queue holds at most {self.MAX_RANGE} priority levels")
+        self.offset = lowest
+        self.buckets = [deque() for _ in range(highest - lowest + 1)]
+        self.cursor = len(self.buckets)
+        self.size = 0
+        # the live entry of every queued task; entries that were cancelled or reprioritised
+        # stay in their bucket and are skipped when they reach the front
+        self.entries = {}
+        # a SchedulerStats to count operations in, None when not instrumented
+        self.stats = None
+ 
+    @classmethod
+    def from_iterable(cls, elements):
+        """
+        Builds a queue from all the entries at once
+        Input: an iterable of (priority, sequence, task) entries
+        Output: a bucket queue holding the entries
+        """
+        elements = list(elements)
+        if not elements:
+            return cls()
+        priorities = [element[0] for element in elements]
+        queue = cls(min(priorities), max(priorities))
+        for element in elements:
+            queue.insert(element)
+        return queue
+ 
+    def __len__(self):
+        return self.size
+ 
+    def __iter__(self):
+        """
+        Output: an iterator over the live entries, not sorted
+        """
+        return iter(list(self.entries.values()))
+ 
+    def __contains__(self, task_id):
+        return task_id in self.entries
+ 
+    def contains(self, task_id):
+        """
+        Input: id of a task
+        Output: returns true if the task is in the queue
+        """
+        return task_id in self.entries
+ 
+    def accepts(self, priority):
+        """
+        Input: a priority
+        Output: returns true if the priority is an integer that keeps the queue within MAX_RANGE levels
+        """
+        if type(priority) is not int:
+            return False
+        if self.size == 0:
+            return True
+        return (max(priority, self.offset + len(self.buckets) - 1) - min(priority, self.offset)) < self.MAX_RANGE
+    
+    def insert(self, element):
+        """
+        Adds an entry to the bucket of its priority, behind the entries with smaller sequence numbers
+        Input: a (priority, sequence, task) entry whose task is not in the queue yet; its priority must
+        be accepted (see accepts)
+        """
+        task_id = element[2].id
+        if task_id in self.entries:
+            raise ValueError(f"task {task_id} is already in the queue")
+        priority = element[0]
+        index = priority - self.offset if type(priority) is int else -1
+        
+        # outside the current range: check the priority, then add buckets below or above it when needed
+        if not 0 <= index < len(self.buckets):
+            if not self.accepts(priority):
+                raise ValueError(f"priority {priority!r} does not fit a bucket queue; use an IndexedMinHeap")
+            if self.size == 0:
+                # an empty queue starts its range over at the new priority; what is left in the buckets is stale
+                self.offset = priority
+                self.buckets = [deque()]
+                self.cursor = 1
+                index = 0
+            elif index < 0:
+                self.buckets[:0] = [deque() for _ in range(-index)]
+                self.offset += index
+                self.cursor -= index
+                index = 0
+            else:
+                self.buckets.extend(deque() for _ in range(index - len(self.buckets) + 1))
+ 
+        # entries nearly always arrive in sequence order; one put back or reprioritised is sorted in
+        bucket = self.buckets[index]
+        if bucket and bucket[-1][1] > element[1]:
+            insort(bucket, element, key=lambda entry: entry[1])
+        else:
+            bucket.append(element)
+        self.entries[task_id] = element
+        self.size += 1
+        if self.stats is not None:
+            self.stats.inserts += 1
+        if index < self.cursor:
+            self.cursor = index
+ 
+    def remove(self):
+        """
+        Removes and pops the first entry of the lowest non-empty bucket
+        Output: the entry with the smallest priority
+        """
+        if self.size == 0:
+            raise IndexError("remove from an empty queue")
+        entries = self.entries
+        while True:
+            bucket = self.buckets[self.cursor]
+            while bucket:
+                element = bucket.popleft()
+                if entries.get(element[2].id) is element:
+                    del entries[element[2].id]
+                    self.size -= 1
+                    if self.stats is not None:
+                        self.stats.removes += 1
+                    return element
+            self.cursor += 1
+ 
+    def update_priority(self, task_id, priority):
+        """
+        Moves a queued task to the bucket of its new priority, keeping its sequence number
+        Input: id of the task and its new priority, which must be accepted (see accepts)
+        """
+        if not self.accepts(priority):
+            raise ValueError(f"priority {priority!r} does not fit a bucket queue; use an IndexedMinHeap")
+        old = self.cancel(task_id)
+        self.insert((priority, old[1], old[2]))
+ 
+    def entry(self, task_id):
+        """
+        Input: id of a queued task
+        Output: its (priority, sequence, task) entry, which stays in the queue
+        """
+        return self.entries[task_id]
+    
+    def cancel(self, task_id):
+        """
+        Removes a queued task from the queue
+        Input: id of the task
+        Output: the removed (priority, sequence, task) entry
+        """
+        element = self.entries.pop(task_id)
+        self.size -= 1
+        return element
@@ -0,0 +1,1373 @@
+"""
+The task scheduler
+"""
+
+import itertools
+import os
+import struct
+import sys
+from array import array
+from time import perf_counter
+
+from .heaps import BucketQueue, IndexedMinHeap, MinHeap
+from .stats import SchedulerStats
+from .table import TaskTable
+from .task import CriticalPathAnalysis, ScheduleEvent, ValidationReport
+
+
+class TaskScheduler:
+    """
+    A simple daily task scheduler using priority queues
+    Input:
+    - tasks: a list of tasks to be sorted by their priorities, or a TaskTable
+    - queue_backend: the ready queue class, picked from the priorities when None
+    Output: 
+    - a list of sorted taks 
+    """
+    # status 
+    NOT_STARTED ='N'
+    IN_PRIORITY_QUEUE = 'I'
+    IN_PROGRESS = 'P'
+    COMPLETED = 'C'
+    CANCELLED = 'X'
+    # a task whose work raised, when the tasks are executed (see AsyncTaskScheduler)
+    FAILED = 'F'
+    STATUSES = (NOT_STARTED, IN_PRIORITY_QUEUE, IN_PROGRESS, COMPLETED, CANCELLED, FAILED)
+    
+    # scheduling modes
+    PRIORITY_ORDER = 'priority'
+    DEPENDENCY_ORDER = 'dependency'
+    CRITICAL_PATH_ORDER = 'critical_path'
+    PRIORITY_CRITICAL_PATH_ORDER = 'priority_critical_path'
+    MODES = (PRIORITY_ORDER, DEPENDENCY_ORDER, CRITICAL_PATH_ORDER, PRIORITY_CRITICAL_PATH_ORDER)
+    
+    # schedule event kinds
+    TASK_STARTED = 'start'
+    TASK_COMPLETED = 'complete'
+    
+    # instrumented phases
+    BUILD_PHASE = 'build'
+    ORDER_PHASE = 'order'
+    EXECUTE_PHASE = 'execute'
+    REPORT_PHASE = 'report'
+    
+    # widest range of integer priorities that gets a BucketQueue when no queue backend is given
+    BUCKET_QUEUE_MAX_RANGE = BucketQueue.MAX_RANGE
+    
+    # topological positions per pass of transitive_reduction: ancestor bitsets hold at most this many bits
+    TRANSITIVE_REDUCTION_BLOCK = 1 << 16
+    
+    # checkpoint files: a little-endian header (magic, format version, index of the mode in MODES or NO_MODE,
+    # whether a schedule was in progress, its clock and starting time, the next sequence number, the number
+    # of tasks and of ready tasks), then the task ids, one status byte per task and the remaining-dependency
+    # counters in task order, then the ids and sequence numbers of the ready tasks, all as 64-bit integers
+    CHECKPOINT_MAGIC = b"SCKP"
+    CHECKPOINT_VERSION = 1
+    CHECKPOINT_HEADER = struct.Struct("<4sHHHqqqqq")
+    NO_MODE = 0xFFFF
+    
+    # initialization
+    def __init__(self, tasks, queue_backend = None):
+        self.tasks = tasks
+        
+        # a TaskTable is scheduled by row number straight from its arrays
+        if isinstance(tasks, TaskTable):
+            self.tasks_by_id = None
+        else:
+            self.tasks_by_id = {task.id: task for task in tasks}
+        
+        # the ready queue class (IndexedMinHeap, BucketQueue or any class with the same methods);
+        # None picks one from the priorities of the tasks
+        self.queue_backend = queue_backend
+        
+        # state of the ready queue, filled in by build_priority_queue
+        self.mode = None
+        self.priority_queue = None
+        self.sequence = None
+        self.dependents = None
+        self.remaining = None
+        self.analysis = None
+        
+        # ids of the tasks left blocked by the last schedule, and its length, working time
+        # summed over all tasks and the share of lane time spent working
+        self.blocked = []
+        self.makespan = 0
+        self.busy_time = 0
+        self.utilisation = 0.0
+        
+        # instrumentation, off until instrument is called
+        self.stats = None
+        self.hooks = []
+        
+        # clock and starting time of the serial schedule in progress, None between schedules,
+        # and the periodic checkpoints, off until checkpoint_every is called
+        self.clock = None
+        self.run_started = None
+        self.checkpoint_path = None
+        self.checkpoint_interval = 0
+        self.checkpoint_writer = None
+        self.checkpoint_error = None
+        
+        # the ids of the tasks in every status, kept up to date by set_status; a TaskTable only keeps
+        # the number of rows in every status, counted when first asked for
+        self.status_index = None
+        self.status_counters = None
+        self.rebuild_status_index()
+            
+    def instrument(self, hooks = ()):
+        """
+        Turns on instrumentation: queue operation counters, dependency edges touched and the
+        wall-clock time of the build, order, execute and report phases of object schedules
+        Input: SchedulerHook objects to call when a phase or a schedule finishes
+        Output: the SchedulerStats the counters are collected in
+        """
+        self.stats = SchedulerStats()
+        self.hooks = list(hooks)
+        if self.priority_queue is not None:
+            self.priority_queue.stats = self.stats
+        return self.stats
+    
+    def phase_finished(self, phase, seconds):
+        """
+        Records the time of a phase and passes it on to the hooks
+        Input: name of the phase and the seconds spent in it
+        """
+        self.stats.add_phase_time(phase, seconds)
+        for hook in self.hooks:
+            hook.phase_finished(phase, seconds, self.stats)
+    
+    def schedule_finished(self):
+        """
+        Passes the stats of a finished schedule on to the hooks
+        """
+        for hook in self.hooks:
+            hook.schedule_finished(self.stats)
+    
+    def require_task_objects(self, operation):
+        """
+        Refuses an operation that works on Task objects when the tasks are a TaskTable, which is only
+        scheduled by iter_table_schedule, with a clear error instead of a TypeError from deep inside it
+        Input: the operation, in the plural, e.g. "ready queues"
+        """
+        if isinstance(self.tasks, TaskTable):
+            raise ValueError(f"{operation} need Task objects, not a TaskTable")
+    
+    def build_dependency_index(self):
+        """
+        Builds the reverse dependency index and the remaining-dependency counters in one pass
+        Input: list of tasks
+        Output: a dictionary from a task id to the ids of the tasks that depend on it and
+        a dictionary from a task id to the number of its dependencies that are not completed yet;
+        tasks that are completed, in progress or failed are never queued again, so their edges are left out
+        """
+        self.require_task_objects("dependency indexes")
+        dependents = {task.id: [] for task in self.tasks}
+        remaining = {}
+        done = (self.COMPLETED, self.IN_PROGRESS, self.FAILED)
+        for task in self.tasks:
+            count = 0
+            if task.status in done:
+                remaining[task.id] = count
+                continue
+            for dependency in task.dependencies:
+                # a dependency on an unknown id can never be completed, so it is left out of the index,
+                # and one that is completed already is satisfied
+                if dependency in dependents and self.tasks_by_id[dependency].status != self.COMPLETED:
+                    dependents[dependency].append(task.id)
+                    count += 1
+            remaining[task.id] = count
+        return dependents, remaining
+    
+    def choose_queue_backend(self):
+        """
+        Picks the ready queue implementation when none was given
+        Input: list of tasks
+        Output: BucketQueue when every priority is an integer within BUCKET_QUEUE_MAX_RANGE levels,
+        otherwise IndexedMinHeap (always for the critical path modes, whose keys are tuples)
+        """
+        if self.mode in (self.CRITICAL_PATH_ORDER, self.PRIORITY_CRITICAL_PATH_ORDER):
+            return IndexedMinHeap
+        priorities = [task.priority for task in self.tasks]
+        if (priorities and all(type(priority) is int for priority in priorities) and
+           max(priorities) - min(priorities) < self.BUCKET_QUEUE_MAX_RANGE):
+            return BucketQueue
+        return IndexedMinHeap
+    
+    def new_queue(self, entries):
+        """
+        Builds the ready queue from all the entries at once (a linear-time heapify for heaps) with the queue
+        backend; a BucketQueue that was asked for but cannot hold the keys is replaced by an IndexedMinHeap
+        Input: list of (key, sequence, task) entries
+        Output: the queue
+        """
+        backend = self.queue_backend or self.choose_queue_backend()
+        keys = [entry[0] for entry in entries]
+        if (issubclass(backend, BucketQueue) and keys and
+           not (all(type(key) is int for key in keys) and max(keys) - min(keys) < backend.MAX_RANGE)):
+            backend = IndexedMinHeap
+        queue = backend.from_iterable(entries)
+        queue.stats = self.stats
+        # entries loaded at once count as inserts too, so inserts covers every entry that entered the queue
+        if self.stats is not None:
+            self.stats.inserts += len(entries)
+        return queue
+    
+    def fit_queue(self, key):
+        """
+        Makes sure the ready queue can take a key: when a BucketQueue cannot (a key that is not an
+        integer, or one that would stretch it past BUCKET_QUEUE_MAX_RANGE levels), its entries are moved
+        to an IndexedMinHeap, which keeps their order
+        Input: the key of an entry about to be queued or of a new priority
+        Output: the ready queue
+        """
+        queue = self.priority_queue
+        if isinstance(queue, BucketQueue) and not queue.accepts(key):
+            heap = IndexedMinHeap.from_iterable(queue)
+            heap.stats = queue.stats
+            self.priority_queue = queue = heap
+        return queue
+    
+    def build_priority_queue(self, mode = PRIORITY_ORDER):
+        """
+        Builds the queue of ready tasks that run_task_scheduler pops from; tasks can be
+        reprioritised or cancelled with update_priority and cancel before and while it runs
+        Input: list of tasks and the scheduling mode:
+        - PRIORITY_ORDER queues every task and runs them strictly by priority
+        - DEPENDENCY_ORDER only queues a task once all of its dependencies are completed
+        - CRITICAL_PATH_ORDER is DEPENDENCY_ORDER running the task with the longest remaining
+          path first, by priority among equal paths
+        - PRIORITY_CRITICAL_PATH_ORDER is DEPENDENCY_ORDER breaking ties between equal
+          priorities by the longest remaining path
+        Tasks that are in progress, completed or cancelled are not queued.
+        Output: a queue of (key, sequence, task) entries built with the queue backend (see queue_key)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"unknown scheduling mode {mode!r}")
+        self.require_task_objects("ready queues")
+        self.mode = mode
+        if self.stats is not None:
+            started = perf_counter()
+        
+        # the dependency-aware modes build the reverse index and counters once, so a completion
+        # only touches its direct dependents instead of scanning every task
+        if mode != self.PRIORITY_ORDER:
+            self.dependents, self.remaining = self.build_dependency_index()
+        if mode in (self.CRITICAL_PATH_ORDER, self.PRIORITY_CRITICAL_PATH_ORDER):
+            self.analysis = self.analyze_critical_path()
+        
+        # the sequence number counts every task entering the queue; it breaks ties between
+        # equal priorities in FIFO order so tasks are never compared
+        self.sequence = itertools.count()
+        ready = [(self.queue_key(task), next(self.sequence), task) for task in self.tasks
+                 if task.status in (self.NOT_STARTED, self.IN_PRIORITY_QUEUE) and
+                 (mode == self.PRIORITY_ORDER or self.remaining[task.id] == 0)]
+        for priority, sequence, task in ready:
+            self.set_status(task, self.IN_PRIORITY_QUEUE)
+        # tasks queued by an earlier build that are not ready in this mode wait to be released again
+        if mode != self.PRIORITY_ORDER and len(ready) != self.count_status(self.IN_PRIORITY_QUEUE):
+            for task in self.tasks:
+                if task.status == self.IN_PRIORITY_QUEUE and self.remaining[task.id]:
+                    self.set_status(task, self.NOT_STARTED)
+        
+        self.priority_queue = self.new_queue(ready)
+        
+        if self.stats is not None:
+            self.phase_finished(self.BUILD_PHASE, perf_counter() - started)
+        return self.priority_queue
+    
+    def complete_task(self, task):
+        """
+        Marks a task as completed and queues the dependents it was the last dependency of;
+        only the direct dependents are touched, so the cost is O(log n) per released task
+        Input: the task just completed
+        """
+        # change the task status
+        self.set_status(task, self.COMPLETED)
+        
+        # priority order ignores dependencies, so there is nothing to release
+        if self.mode == self.PRIORITY_ORDER:
+            return
+        
+        if self.stats is not None:
+            self.stats.dependency_edges += len(self.dependents[task.id])
+        
+        # release the dependents whose last outstanding dependency was this task,
+        # moving them within the status index as set_status does
+        index = self.status_index
+        queued = index[self.IN_PRIORITY_QUEUE]
+        for dependent_id in self.dependents[task.id]:
+            self.remaining[dependent_id] -= 1
+            dependent = self.tasks_by_id[dependent_id]
+            if self.remaining[dependent_id] == 0 and dependent.status == self.NOT_STARTED:
+                entry = (self.queue_key(dependent), next(self.sequence), dependent)
+                try:
+                    self.priority_queue.insert(entry)
+                except ValueError:
+                    # a key the BucketQueue cannot hold, which is rare enough to not check for first
+                    self.fit_queue(entry[0]).insert(entry)
+                index[dependent.status].pop(dependent_id, None)
+                queued[dependent_id] = None
+                dependent.status = self.IN_PRIORITY_QUEUE
+    
+    def add_task(self, task):
+        """
+        Adds a task while the scheduler is running; only the new task and its dependencies are touched.
+        Dependencies on completed tasks are already satisfied, while dependencies on ids that are not
+        known yet are ignored, as in build_dependency_index
+        Input: a task with an id that is not used yet
+        """
+        self.require_task_objects("added tasks")
+        if task.id in self.tasks_by_id:
+            raise ValueError(f"task {task.id} already exists")
+        self.tasks.append(task)
+        self.tasks_by_id[task.id] = task
+        self.status_index.setdefault(task.status, {})[task.id] = None
+        if self.priority_queue is None:
+            return
+        
+        # count and index the outstanding dependencies of the new task
+        if self.mode != self.PRIORITY_ORDER:
+            self.dependents[task.id] = []
+            count = 0
+            for dependency in task.dependencies:
+                if (task.status in (self.NOT_STARTED, self.IN_PRIORITY_QUEUE) and dependency in self.tasks_by_id and
+                   self.tasks_by_id[dependency].status != self.COMPLETED):
+                    self.dependents[dependency].append(task.id)
+                    count += 1
+            self.remaining[task.id] = count
+            if count:
+                return
+        if task.status in (self.NOT_STARTED, self.IN_PRIORITY_QUEUE):
+            key = self.queue_key(task)
+            self.fit_queue(key).insert((key, next(self.sequence), task))
+            self.set_status(task, self.IN_PRIORITY_QUEUE)
+    
+    def next_task(self):
+        """
+        Pops the ready task with the smallest priority and marks it as in progress; the queue is built
+        with the default mode first if build_priority_queue was not called
+        Output: the task, or None when no task is ready
+        """
+        self.require_task_objects("ready queues")
+        if self.priority_queue is None:
+            self.build_priority_queue()
+        if self.priority_queue.size == 0:
+            return None
+        priority, sequence, task = self.priority_queue.remove()
+        self.set_status(task, self.IN_PROGRESS)
+        return task
+    
+    def mark_completed(self, task_id):
+        """
+        Records that a task finished (also one that was never handed out by next_task)
+        and releases its dependents
+        Input: id of the task
+        """
+        self.require_task_objects("updates by task id")
+        task = self.tasks_by_id[task_id]
+        if task.status in (self.COMPLETED, self.CANCELLED):
+            raise ValueError(f"task {task_id} is already {'completed' if task.status == self.COMPLETED else 'cancelled'}")
+        if self.priority_queue is None:
+            self.set_status(task, self.COMPLETED)
+            return
+        if self.contains(task_id):
+            self.priority_queue.cancel(task_id)
+        self.complete_task(task)
+    
+    def contains(self, task_id):
+        """
+        Input: id of a task
+        Output: returns true if the task is waiting in the ready queue
+        """
+        return self.priority_queue is not None and task_id in self.priority_queue
+    
+    def update_priority(self, task_id, priority):
+        """
+        Changes the priority of a task; a queued task is moved within the queue in O(log n) or better
+        Input: id of the task and its new priority
+        """
+        self.require_task_objects("updates by task id")
+        task = self.tasks_by_id[task_id]
+        task.priority = priority
+        if self.contains(task_id):
+            key = self.queue_key(task)
+            self.fit_queue(key).update_priority(task_id, key)
+    
+    def cancel(self, task_id):
+        """
+        Cancels a task so it is never executed; a queued task is removed from the queue in O(log n) or better
+        and tasks that depend on it stay blocked
+        Input: id of the task
+        """
+        self.require_task_objects("updates by task id")
+        if self.contains(task_id):
+            self.priority_queue.cancel(task_id)
+        self.set_status(self.tasks_by_id[task_id], self.CANCELLED)
+    
+    def cancel_dependents(self, task_id):
+        """
+        Cancels the tasks that can no longer run because a task failed or was cancelled
+        Input: id of the failed or cancelled task
+        Output: list of the ids of the tasks cancelled
+        """
+        self.require_task_objects("updates by task id")
+        cancelled = []
+        if self.mode == self.PRIORITY_ORDER:
+            return cancelled
+        stack = list(self.dependents[task_id])
+        while stack:
+            dependent = self.tasks_by_id[stack.pop()]
+            # dependents of a task that has not finished are never queued, so there is nothing to remove
+            if dependent.status in (self.CANCELLED, self.COMPLETED, self.FAILED):
+                continue
+            self.set_status(dependent, self.CANCELLED)
+            cancelled.append(dependent.id)
+            stack.extend(self.dependents[dependent.id])
+        return cancelled
+    
+    def validate(self):
+        """
+        Checks the tasks before scheduling in O(V+E), without recursion, and reports every problem at once
+        Input: list of tasks
+        Output: a ValidationReport with
+        - cycles: one cycle per group of tasks that depend on each other, as a list of ids where every
+          task depends on the next one and the last one on the first
+        - dangling_dependencies: (task id, missing id) pairs for dependencies on unknown ids
+        - duplicate_ids: ids used by more than one task (the first of them is checked for cycles)
+        - dangling_multitask: (task id, missing id) pairs for multitask ids of unknown tasks
+        A TaskTable is checked from its rows; its dangling dependencies are the ones its loader left out
+        """
+        if isinstance(self.tasks, TaskTable):
+            return self.validate_table()
+        first_tasks = {}
+        duplicate_ids = {}
+        for task in self.tasks:
+            if task.id in first_tasks:
+                duplicate_ids[task.id] = True
+            else:
+                first_tasks[task.id] = task
+        
+        # the graph points from a task to its known dependencies
+        graph = {}
+        dangling_dependencies = []
+        dangling_multitask = []
+        for task in self.tasks:
+            edges = []
+            for dependency in task.dependencies:
+                if dependency in first_tasks:
+                    edges.append(dependency)
+                else:
+                    dangling_dependencies.append((task.id, dependency))
+            for other_id in task.multitask:
+                if other_id not in first_tasks:
+                    dangling_multitask.append((task.id, other_id))
+            if first_tasks[task.id] is task:
+                graph[task.id] = edges
+        duplicate_ids = list(duplicate_ids)
+        
+        cycles = [self.find_cycle(graph, component) for component in self.strongly_connected_components(graph)]
+        return ValidationReport(cycles, dangling_dependencies, duplicate_ids, dangling_multitask)
+    
+    def validate_table(self):
+        """
+        Checks a TaskTable like validate checks a list of tasks; the graph is built over row numbers,
+        and a table has no multitask ids
+        Output: a ValidationReport
+        """
+        table = self.tasks
+        ids = table.ids
+        first_rows = {}
+        duplicate_ids = {}
+        for row in range(len(table)):
+            if ids[row] in first_rows:
+                duplicate_ids[ids[row]] = True
+            else:
+                first_rows[ids[row]] = row
+        
+        # the graph points from a row to its dependency rows; with duplicate ids only the first row of
+        # every id is checked, so the edges are moved to the first rows like validate does by id
+        if duplicate_ids:
+            graph = {row: [first_rows[ids[dependency]] for dependency in table.dependencies(row)]
+                     for row in first_rows.values()}
+        else:
+            graph = {row: table.dependencies(row) for row in range(len(table))}
+        
+        cycles = [[ids[row] for row in self.find_cycle(graph, component)]
+                  for component in self.strongly_connected_components(graph)]
+        return ValidationReport(cycles, list(table.dangling), list(duplicate_ids), [])
+    
+    def strongly_connected_components(self, graph):
+        """
+        Finds the groups of tasks that can reach each other with an iterative version of Tarjan's algorithm
+        Input: a dictionary from a task id to the ids it points to
+        Output: the components that contain a cycle (more than one task, or a task pointing to itself)
+        """
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        for root in graph:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        # descend into the child and come back to the remaining children later
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(graph[child])))
+                        break
+                    if child in on_stack and index[child] < low[node]:
+                        low[node] = index[child]
+                else:
+                    work.pop()
+                    if work and low[node] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[node]
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in graph[node]:
+                            components.append(component)
+        return components
+    
+    def find_cycle(self, graph, component):
+        """
+        Walks inside a strongly connected component until a task repeats, which closes a cycle
+        Input: a dictionary from a task id to the ids it points to and one of its components
+        Output: the ids along the cycle
+        """
+        members = set(component)
+        positions = {}
+        path = []
+        node = component[0]
+        while node not in positions:
+            positions[node] = len(path)
+            path.append(node)
+            node = next(child for child in graph[node] if child in members)
+        return path[positions[node]:]
+    
+    def topological_order(self):
+        """
+        Orders the tasks so that every task comes after its dependencies (Kahn's algorithm,
+        iterative, O(V+E)); dependencies on unknown ids are ignored
+        Input: list of tasks
+        Output: the tasks in topological order, which leaves out every task caught in or behind
+        a dependency cycle, and a dictionary from a task id to the ids of its dependents
+        """
+        self.require_task_objects("topological orders")
+        dependents = {task.id: [] for task in self.tasks}
+        indegree = {}
+        for task in self.tasks:
+            count = 0
+            for dependency in task.dependencies:
+                if dependency in dependents:
+                    dependents[dependency].append(task.id)
+                    count += 1
+            indegree[task.id] = count
+        
+        order = [task for task in self.tasks if indegree[task.id] == 0]
+        # the list doubles as the queue of tasks whose dependencies are all placed
+        for task in order:
+            for dependent_id in dependents[task.id]:
+                indegree[dependent_id] -= 1
+                if indegree[dependent_id] == 0:
+                    order.append(self.tasks_by_id[dependent_id])
+        return order, dependents
+    
+    def transitive_reduction(self, block_size = TRANSITIVE_REDUCTION_BLOCK):
+        """
+        Removes the dependencies a task also has through another of its dependencies (2 depends on [0, 1] while
+        1 depends on 0), which never change the schedule but are walked on every completion. Ancestor sets
+        are bitsets over the positions in topological order, built in one pass per block of block_size
+        positions so memory stays bounded on large plans; a task's set is dropped once its last dependent
+        is reduced. Dependencies on unknown or completed tasks are left alone, as the schedule ignores them
+        Input: list of tasks and the number of positions per block
+        Output: the number of dependencies removed; the dependency lists are changed in place
+        """
+        self.require_task_objects("transitive reductions")
+        order = self.topological_order()[0]
+        if len(order) != len(self.tasks):
+            raise ValueError("the dependency graph has a cycle; see validate() for details")
+        position = {task.id: number for number, task in enumerate(order)}
+        
+        # the positions of every task's outstanding dependencies, latest first, so a dependency is only
+        # checked once every dependency that could lead to it has been added to the ancestors
+        dependency_positions = [sorted({position[dependency] for dependency in task.dependencies
+                                        if dependency in position and
+                                        self.tasks_by_id[dependency].status != self.COMPLETED}, reverse=True)
+                                for task in order]
+        uses = [0] * len(order)
+        for positions in dependency_positions:
+            for dependency in positions:
+                uses[dependency] += 1
+        
+        redundant = set()
+        for low in range(0, len(order), block_size):
+            high = low + block_size
+            # ancestors of every task among the positions of the block, bit 0 being position low
+            ancestors = {}
+            waiting = uses[:]
+            for number in range(low, len(order)):
+                covered = 0
+                for dependency in dependency_positions[number]:
+                    # earlier positions belong to earlier blocks
+                    if dependency < low:
+                        break
+                    if dependency < high:
+                        bit = 1 << (dependency - low)
+                        if covered & bit:
+                            redundant.add((number, dependency))
+                        covered |= bit
+                    covered |= ancestors.get(dependency, 0)
+                    
+                    # drop the ancestors of a task once all of its dependents are reduced
+                    waiting[dependency] -= 1
+                    if not waiting[dependency]:
+                        ancestors.pop(dependency, None)
+                if covered:
+                    ancestors[number] = covered
+        
+        # keep the first of repeated dependencies and every dependency not reached through another one
+        removed = 0
+        for number, task in enumerate(order):
+            kept = []
+            seen = set()
+            for dependency in task.dependencies:
+                if dependency in seen or (dependency in position and (number, position[dependency]) in redundant):
+                    continue
+                seen.add(dependency)
+                kept.append(dependency)
+            removed += len(task.dependencies) - len(kept)
+            task.dependencies[:] = kept
+        return removed
+    
+    def simulate(self, scenarios = 10000, mode = DEPENDENCY_ORDER, run = "serial", **options):
+        """
+        Simulates the plan with uncertain durations in many scenarios at once with NumPy; see simulation.simulate
+        Input: the number of scenarios, the scheduling mode, "serial" or "unlimited" and the simulation options
+        Output: a SimulationResult with the makespan and per-task finish-time distributions
+        """
+        from .simulation import simulate
+        return simulate(self, scenarios, mode, run, **options)
+    
+    def analyze_critical_path(self):
+        """
+        Computes the earliest and latest start of every task, its slack and the critical path
+        with a longest-path pass over the dependency graph in topological order, in O(V+E)
+        Input: list of tasks
+        Output: a CriticalPathAnalysis; times are minutes from the start of the plan and
+        remaining is the longest path from a task (including its own duration) to the end of the plan
+        """
+        self.require_task_objects("critical path analyses")
+        order, dependents = self.topological_order()
+        if len(order) != len(self.tasks):
+            raise ValueError("the dependency graph has a cycle; see validate() for details")
+        tasks_by_id = self.tasks_by_id
+        
+        # earliest start: the latest finish among the dependencies
+        earliest_start = {}
+        for task in order:
+            start = 0
+            for dependency in task.dependencies:
+                if dependency in earliest_start:
+                    finish = earliest_start[dependency] + tasks_by_id[dependency].duration
+                    if finish > start:
+                        start = finish
+            earliest_start[task.id] = start
+        
+        # remaining path length: the task itself plus the longest remaining path among its dependents
+        remaining = {}
+        for task in reversed(order):
+            longest = 0
+            for dependent_id in dependents[task.id]:
+                if remaining[dependent_id] > longest:
+                    longest = remaining[dependent_id]
+            remaining[task.id] = task.duration + longest
+        
+        length = max(remaining.values(), default=0)
+        latest_start = {task_id: length - path for task_id, path in remaining.items()}
+        slack = {task_id: latest_start[task_id] - earliest_start[task_id] for task_id in latest_start}
+        
+        # follow the zero-slack tasks from the start of the plan, each starting when the previous one finishes
+        critical_path = []
+        current = next((task for task in order if earliest_start[task.id] == 0 and slack[task.id] == 0), None)
+        while current is not None:
+            critical_path.append(current.id)
+            finish = earliest_start[current.id] + current.duration
+            current = next((tasks_by_id[dependent_id] for dependent_id in dependents[current.id]
+                            if slack[dependent_id] == 0 and earliest_start[dependent_id] == finish), None)
+        
+        return CriticalPathAnalysis(earliest_start, latest_start, slack, remaining, critical_path, length)
+    
+    def queue_key(self, task):
+        """
+        Input: a task
+        Output: the key the ready queue orders the task by in the current mode
+        """
+        if self.mode == self.CRITICAL_PATH_ORDER:
+            return (-self.analysis.remaining.get(task.id, task.duration), task.priority)
+        if self.mode == self.PRIORITY_CRITICAL_PATH_ORDER:
+            return (task.priority, -self.analysis.remaining.get(task.id, task.duration))
+        return task.priority
+    
+    def remove_dependency(self, task_id):
+        """
+        Removes a task from the task list
+        Input: list of taks and task_id of the task just completed
+        Output: lists of tasks with t_id removed
+        """
+        for t in self.tasks:
+            if t.id != task_id and task_id in t.dependencies:
+                t.dependencies.remove(task_id)           
+         
+    
+    def rebuild_status_index(self):
+        """
+        Indexes the tasks by status from scratch; statuses written straight to the tasks instead of through
+        set_status are only picked up here. A TaskTable has no index: its counters are dropped and counted
+        again from the statuses array when next asked for (and before every schedule)
+        Input: list of tasks (or a TaskTable)
+        """
+        if isinstance(self.tasks, TaskTable):
+            self.status_counters = None
+            return
+        # every status maps to a dictionary used as an ordered set of ids
+        index = {status: {} for status in self.STATUSES}
+        for task in self.tasks:
+            index.setdefault(task.status, {})[task.id] = None
+        self.status_index = index
+    
+    def table_status_counters(self):
+        """
+        Output: the list of the number of rows of the TaskTable in every status, by status code, counted
+        from the statuses array with one byte search per status when they are not known
+        """
+        if self.status_counters is None:
+            statuses = bytes(self.tasks.statuses)
+            self.status_counters = [statuses.count(code) for code in range(len(TaskTable.STATUSES))]
+        return self.status_counters
+    
+    def set_status(self, task, status):
+        """
+        Changes the status of a task and moves it within the status index in O(1)
+        Input: a task and its new status
+        """
+        index = self.status_index
+        index[task.status].pop(task.id, None)
+        index[status][task.id] = None
+        task.status = status
+    
+    def count_status(self, status):
+        """
+        Input: a status
+        Output: the number of tasks in it, in O(1)
+        """
+        if self.status_index is None:
+            code = TaskTable.STATUSES.find(status) if len(status) == 1 else -1
+            return self.table_status_counters()[code] if code >= 0 else 0
+        return len(self.status_index.get(status, ()))
+    
+    def ids_with_status(self, status):
+        """
+        Input: a status
+        Output: list of the ids of the tasks in it, in O(k) for k tasks; for a TaskTable the statuses
+        array is searched, which is O(n) but runs at byte-search speed outside the k rows found
+        """
+        if self.status_index is None:
+            code = TaskTable.STATUSES.find(status) if len(status) == 1 else -1
+            if code < 0:
+                return []
+            ids = self.tasks.ids
+            statuses = bytes(self.tasks.statuses)
+            found = []
+            row = statuses.find(code)
+            while row != -1:
+                found.append(ids[row])
+                row = statuses.find(code, row + 1)
+            return found
+        return list(self.status_index.get(status, ()))
+    
+    def status_counts(self):
+        """
+        Output: a dictionary from every status to the number of tasks in it
+        """
+        if self.status_index is None:
+            return dict(zip(TaskTable.STATUSES, self.table_status_counters()))
+        return {status: len(ids) for status, ids in self.status_index.items()}
+    
+    def check_unscheduled_tasks(self):
+        """
+        Checks wheather the task is scheduled
+        Input: list of tasks 
+        Output: boolean, True if at least one task has status = 'N', in O(1) from the status index
+        """
+        return self.count_status(self.NOT_STARTED) > 0
+    
+    def format_time(self, time):
+        """
+        Formats time
+        Input: list of tasks and time
+        Output: time written in from hours and minutes
+        """
+        return f"{time//60}h{time%60:02d}"
+    
+    def checkpoint_ids(self):
+        """
+        Output: the task ids as the 64-bit integers checkpoints store them as
+        """
+        if self.tasks_by_id is None:
+            raise ValueError("checkpoints are not supported for a TaskTable")
+        try:
+            return array('q', [task.id for task in self.tasks])
+        except (TypeError, OverflowError):
+            raise ValueError("checkpoints need 64-bit integer task ids") from None
+    
+    def snapshot(self):
+        """
+        Encodes the progress of the scheduler: the ready queue, the remaining-dependency counters, the
+        statuses, the sequence counter and the clock of the serial schedule in progress. Tasks in progress
+        are saved as ready, ahead of the ready tasks with the same key, so they run again after a resume
+        Output: the snapshot as bytes (see CHECKPOINT_HEADER)
+        """
+        tasks = self.tasks
+        ids = self.checkpoint_ids()
+        statuses = "".join([task.status for task in tasks]).encode("ascii")
+        remaining = array('q', bytes(8 * len(tasks)))
+        ready_ids = array('q')
+        sequences = array('q')
+        mode = self.NO_MODE
+        next_sequence = 0
+        if self.priority_queue is not None:
+            mode = self.MODES.index(self.mode)
+            if self.remaining is not None:
+                remaining = array('q', [self.remaining[task.id] for task in tasks])
+            for key, sequence, task in self.priority_queue:
+                ready_ids.append(task.id)
+                sequences.append(sequence)
+            in_progress = [task.id for task in tasks if task.status == self.IN_PROGRESS]
+            ready_ids.extend(in_progress)
+            sequences.extend(range(-len(in_progress), 0))
+            statuses = statuses.replace(self.IN_PROGRESS.encode("ascii"), self.IN_PRIORITY_QUEUE.encode("ascii"))
+            # read the next sequence number without losing it
+            next_sequence = next(self.sequence)
+            self.sequence = itertools.count(next_sequence)
+        
+        header = self.CHECKPOINT_HEADER.pack(self.CHECKPOINT_MAGIC, self.CHECKPOINT_VERSION, mode,
+                                             self.clock is not None, self.clock or 0, self.run_started or 0,
+                                             next_sequence, len(ids), len(ready_ids))
+        columns = [ids, remaining, ready_ids, sequences]
+        # the arrays are stored little-endian like the header
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        return b"".join([header, ids.tobytes(), statuses, remaining.tobytes(), ready_ids.tobytes(), sequences.tobytes()])
+    
+    def checkpoint(self, path, background = False):
+        """
+        Saves a snapshot of the scheduler to a file; the file is replaced only once the snapshot is written
+        in full, so a crash while writing leaves the previous checkpoint intact
+        Input: path of the checkpoint file and background, which writes the file in a thread so the
+        schedule carries on while it is written (wait_for_checkpoint waits for it)
+        """
+        data = self.snapshot()
+        self.wait_for_checkpoint()
+        if background:
+            # imported here, like the other optional backends, so importing the package stays fast
+            import threading
+            self.checkpoint_writer = threading.Thread(target=self.write_checkpoint, args=(path, data), daemon=True)
+            self.checkpoint_writer.start()
+        else:
+            self.write_checkpoint(path, data)
+            self.wait_for_checkpoint()
+            
+    def write_checkpoint(self, path, data):
+        """
+        Writes an encoded snapshot to a file through a temporary file
+        Input: path of the checkpoint file and the snapshot
+        """
+        try:
+            with open(path + ".tmp", "wb") as file:
+                file.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError as error:
+            self.checkpoint_error = error
+    
+    def wait_for_checkpoint(self):
+        """
+        Waits until a checkpoint written in the background is on disk, and raises the error it failed with
+        """
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.join()
+            self.checkpoint_writer = None
+        if self.checkpoint_error is not None:
+            error, self.checkpoint_error = self.checkpoint_error, None
+            raise error
+    
+    def checkpoint_every(self, path, completed_tasks = 100000):
+        """
+        Turns on periodic checkpoints of the serial schedule: a checkpoint is written in the background
+        every completed_tasks tasks
+        Input: path of the checkpoint file and the number of tasks between checkpoints; None for path
+        turns the periodic checkpoints off
+        """
+        if completed_tasks < 1:
+            raise ValueError("completed_tasks must be at least 1")
+        self.checkpoint_path = path
+        self.checkpoint_interval = completed_tasks
+    
+    def resume(self, path):
+        """
+        Restores the progress saved by checkpoint into a scheduler made with the same list of tasks;
+        iter_schedule and run_task_scheduler then carry on from the saved clock and ready queue
+        Input: path of the checkpoint file
+        """
+        task_ids = self.checkpoint_ids()
+        with open(path, "rb") as file:
+            data = file.read()
+        header = self.CHECKPOINT_HEADER
+        if len(data) < header.size:
+            raise ValueError("not a scheduler checkpoint of a supported version")
+        magic, version, mode, has_clock, clock, run_started, next_sequence, count, ready_count = header.unpack_from(data)
+        if magic != self.CHECKPOINT_MAGIC or version != self.CHECKPOINT_VERSION:
+            raise ValueError("not a scheduler checkpoint of a supported version")
+        if len(data) != header.size + 17 * count + 16 * ready_count:
+            raise ValueError("the checkpoint is truncated")
+        
+        # split the columns back out of the snapshot
+        offset = header.size
+        ids = array('q', data[offset:offset + 8 * count])
+        offset += 8 * count
+        statuses = data[offset:offset + count].decode("ascii")
+        offset += count
+        remaining = array('q', data[offset:offset + 8 * count])
+        offset += 8 * count
+        ready_ids = array('q', data[offset:offset + 8 * ready_count])
+        offset += 8 * ready_count
+        sequences = array('q', data[offset:offset + 8 * ready_count])
+        if sys.byteorder == "big":
+            for column in (ids, remaining, ready_ids, sequences):
+                column.byteswap()
+        if ids != task_ids:
+            raise ValueError("the checkpoint was taken of a different list of tasks")
+        
+        for task, status in zip(self.tasks, statuses):
+            task.status = status
+        self.rebuild_status_index()
+        self.clock = clock if has_clock else None
+        self.run_started = run_started if has_clock else None
+        if mode == self.NO_MODE:
+            self.mode = self.priority_queue = self.sequence = self.dependents = self.remaining = None
+            return
+        
+        # rebuild the ready queue from the saved entries; the keys come from the tasks
+        self.mode = self.MODES[mode]
+        if self.mode == self.PRIORITY_ORDER:
+            self.dependents = self.remaining = None
+        else:
+            self.dependents = self.build_dependency_index()[0]
+            self.remaining = dict(zip(ids, remaining))
+        if self.mode in (self.CRITICAL_PATH_ORDER, self.PRIORITY_CRITICAL_PATH_ORDER):
+            self.analysis = self.analyze_critical_path()
+        self.sequence = itertools.count(next_sequence)
+        tasks_by_id = self.tasks_by_id
+        ready = [(self.queue_key(tasks_by_id[task_id]), sequence, tasks_by_id[task_id])
+                 for task_id, sequence in zip(ready_ids, sequences)]
+        # a BucketQueue keeps equal priorities in insertion order, so insert by sequence number
+        # (the saved order already is, apart from the tasks that were in progress)
+        ready.sort(key=lambda entry: entry[1])
+        self.priority_queue = self.new_queue(ready)
+    
+    def iter_schedule(self, starting_time = 480, mode = PRIORITY_ORDER, workers = 1, multitask = False):
+        """
+        Computes the schedule lazily, one event at a time
+        Input: list of tasks (or a TaskTable), starting time of first task of the day, the scheduling mode
+        (see build_priority_queue), and the lanes and multitask rule for a parallel schedule (see
+        iter_parallel_schedule); a queue already prepared with build_priority_queue is used as it is
+        Output: a generator of ScheduleEvent records, a TASK_STARTED and a TASK_COMPLETED event per task;
+        once it is exhausted self.blocked lists the ids of the tasks that never became ready
+        """
+        if workers > 1 or multitask:
+            yield from self.iter_parallel_schedule(starting_time, mode, workers, multitask)
+            return
+        if isinstance(self.tasks, TaskTable):
+            yield from self.iter_table_schedule(starting_time, mode)
+            return
+        
+        # assign starting_time to current_time; a resumed schedule carries on from its checkpoint
+        if self.clock is not None:
+            starting_time = self.run_started
+            current_time = self.clock
+        else:
+            current_time = starting_time
+        
+        if self.priority_queue is None:
+            self.build_priority_queue(mode)
+        self.run_started = starting_time
+        self.clock = current_time
+        completed = 0
+        
+        # time spent popping tasks and releasing dependents when instrumented
+        stats = self.stats
+        order_seconds = execute_seconds = 0.0
+        
+        # the task between its start and completion events; a schedule closed early (a caller that stops
+        # reading) puts it back in the queue and drops the queue and the clock in the finally clause below,
+        # so the next schedule starts over from the statuses instead of the leftovers of this one
+        in_flight = None
+        try:
+            # run the function below while priority_queue has an unscheduled task
+            while self.priority_queue.size != 0:
+                
+                # pop the root of the priority_queue heap and take the task straight from the entry
+                if stats is not None:
+                    started = perf_counter()
+                priority, sequence, task = self.priority_queue.remove()
+                if stats is not None:
+                    order_seconds += perf_counter() - started
+                
+                self.set_status(task, self.IN_PROGRESS)
+                in_flight = task
+                start_time = current_time
+                current_time += task.duration
+                yield ScheduleEvent(self.TASK_STARTED, task.id, task.priority, task.description, start_time, current_time)
+                
+                # complete the task before reporting it, so a checkpoint taken once the event is seen includes it
+                if stats is not None:
+                    started = perf_counter()
+                self.complete_task(task)
+                in_flight = None
+                if stats is not None:
+                    execute_seconds += perf_counter() - started
+                self.clock = current_time
+                
+                completed += 1
+                if self.checkpoint_path is not None and completed % self.checkpoint_interval == 0:
+                    self.checkpoint(self.checkpoint_path, background=True)
+                yield ScheduleEvent(self.TASK_COMPLETED, task.id, task.priority, task.description, start_time, current_time)
+            
+            self.blocked = self.find_blocked()
+            self.makespan = self.busy_time = current_time - starting_time
+            self.utilisation = 1.0 if self.makespan else 0.0
+        finally:
+            if in_flight is not None:
+                self.set_status(in_flight, self.IN_PRIORITY_QUEUE)
+            self.priority_queue = None
+            self.clock = self.run_started = None
+            self.wait_for_checkpoint()
+        if stats is not None:
+            self.phase_finished(self.ORDER_PHASE, order_seconds)
+            self.phase_finished(self.EXECUTE_PHASE, execute_seconds)
+            self.schedule_finished()
+    
+    def find_blocked(self):
+        """
+        Finds the tasks caught in a dependency cycle or depending on a cancelled task, which never become ready
+        Output: list of their ids
+        """
+        if self.mode == self.PRIORITY_ORDER:
+            return []
+        return [task.id for task in self.tasks
+                if self.remaining[task.id] > 0 and task.status != self.CANCELLED]
+    
+    def can_multitask(self, task, running):
+        """
+        Checks whether a task may run alongside the running ones; two tasks can run together
+        when either lists the other in its multitask ids
+        Input: a task and the tasks currently running
+        Output: boolean
+        """
+        for other in running:
+            if other.id not in task.multitask and task.id not in other.multitask:
+                return False
+        return True
+    
+    def multitask_partners(self):
+        """
+        Indexes the tasks every task may run alongside
+        Input: list of tasks
+        Output: a dictionary from every task id to the set of ids of the tasks it lists in its multitask ids
+        or that list it in theirs
+        """
+        partners = {task.id: set(task.multitask) for task in self.tasks}
+        for task in self.tasks:
+            for other_id in task.multitask:
+                partners.setdefault(other_id, set()).add(task.id)
+        return partners
+    
+    def next_multitask_entry(self, running, partners):
+        """
+        Takes the first ready task in queue order that may run alongside all the running ones off the queue.
+        Only the partners of a running task can, so only those of the running task with the fewest are
+        looked at, in O(p log n) for p partners instead of a pass over the whole queue
+        Input: the running tasks and the partners of every task (see multitask_partners)
+        Output: the (key, sequence, task) entry, or None when no ready task may run alongside them
+        """
+        queue = self.priority_queue
+        candidates = min((partners.get(task.id, ()) for task in running), key=len)
+        best = None
+        for task_id in candidates:
+            if task_id in queue:
+                entry = queue.entry(task_id)
+                if (best is None or entry[:2] < best[:2]) and self.can_multitask(entry[2], running):
+                    best = entry
+        if best is not None:
+            queue.cancel(best[2].id)
+        return best
+    
+    def iter_parallel_schedule(self, starting_time = 480, mode = PRIORITY_ORDER, workers = 2, multitask = False):
+        """
+        Computes a schedule over several lanes with a discrete-event simulation: ready tasks start in priority
+        order on free lanes and the clock jumps straight to the next completion
+        Input: list of tasks, starting time of first task of the day, the scheduling mode, the number of
+        lanes (workers) and whether tasks may only overlap when their multitask ids allow it
+        Output: a generator of ScheduleEvent records with their lane; once it is exhausted self.makespan,
+        self.busy_time and self.utilisation describe the schedule
+        """
+        self.require_task_objects("parallel schedules")
+        if workers < 1:
+            raise ValueError("at least one worker is needed")
+        
+        # assign starting_time to current_time
+        current_time = starting_time
+        busy_time = 0
+        
+        if self.priority_queue is None:
+            self.build_priority_queue(mode)
+        
+        # (end time, sequence, task, lane) entries of the running tasks and the numbers of the free lanes
+        completions = MinHeap(workers)
+        free_lanes = MinHeap.from_iterable(range(workers))
+        running = {}
+        sequence = itertools.count()
+        partners = self.multitask_partners() if multitask else {}
+        indexed = len(self.tasks)
+        
+        # time spent popping tasks and releasing dependents when instrumented
+        stats = self.stats
+        order_seconds = execute_seconds = 0.0
+        
+        # as in iter_schedule, a schedule closed early puts the running tasks back in the queue and drops it
+        try:
+            while self.priority_queue.size != 0 or completions.size != 0:
+                
+                # start ready tasks on the free lanes; with multitask on and tasks running, the next one is
+                # the first in queue order that may overlap with all of them, and the others keep their place
+                while free_lanes.size != 0 and self.priority_queue.size != 0:
+                    if stats is not None:
+                        started = perf_counter()
+                    if multitask and running:
+                        # index the partners again when tasks were added while running
+                        if indexed != len(self.tasks):
+                            partners = self.multitask_partners()
+                            indexed = len(self.tasks)
+                        entry = self.next_multitask_entry(running.values(), partners)
+                    else:
+                        entry = self.priority_queue.remove()
+                    if stats is not None:
+                        order_seconds += perf_counter() - started
+                    if entry is None:
+                        break
+                    task = entry[2]
+                    lane = free_lanes.remove()
+                    running[lane] = task
+                    self.set_status(task, self.IN_PROGRESS)
+                    completions.insert((current_time + task.duration, next(sequence), task, lane))
+                    yield ScheduleEvent(self.TASK_STARTED, task.id, task.priority, task.description,
+                                        current_time, current_time + task.duration, lane)
+                
+                if completions.size == 0:
+                    break
+                
+                # jump to the next completion and finish every task that ends at that time
+                # before any lane is handed out again
+                current_time = completions.Heap[completions.FRONT][0]
+                while completions.size != 0 and completions.Heap[completions.FRONT][0] == current_time:
+                    end_time, order, task, lane = completions.remove()
+                    busy_time += task.duration
+                    # complete the task before reporting it, as in iter_schedule
+                    if stats is not None:
+                        started = perf_counter()
+                    self.complete_task(task)
+                    if stats is not None:
+                        execute_seconds += perf_counter() - started
+                    del running[lane]
+                    free_lanes.insert(lane)
+                    yield ScheduleEvent(self.TASK_COMPLETED, task.id, task.priority, task.description,
+                                        end_time - task.duration, end_time, lane)
+            
+            self.blocked = self.find_blocked()
+            self.makespan = current_time - starting_time
+            self.busy_time = busy_time
+            self.utilisation = busy_time / (workers * self.makespan) if self.makespan else 0.0
+        finally:
+            for task in running.values():
+                self.set_status(task, self.IN_PRIORITY_QUEUE)
+            self.priority_queue = None
+        if stats is not None:
+            self.phase_finished(self.ORDER_PHASE, order_seconds)
+            self.phase_finished(self.EXECUTE_PHASE, execute_seconds)
+            self.schedule_finished()
+    
+    def iter_table_schedule(self, starting_time = 480, mode = PRIORITY_ORDER):
+        """
+        Computes the schedule of a TaskTable lazily using row numbers and typed arrays only,
+        without creating a Task object per task
+        Input: a TaskTable, starting time of first task of the day and the scheduling mode
+        Output: a generator of ScheduleEvent records (see iter_schedule)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"unknown scheduling mode {mode!r}")
+        if mode not in (self.PRIORITY_ORDER, self.DEPENDENCY_ORDER):
+            raise ValueError("the critical-path modes need Task objects, not a TaskTable")
+        table = self.tasks
+        ids = table.ids
+        priorities = table.priorities
+        durations = table.durations
+        descriptions = table.descriptions
+        statuses = table.statuses
+        
+        # assign starting_time to current_time
+        current_time = starting_time
+        
+        # in dependency mode count the outstanding dependencies and index the dependents once;
+        # as in build_dependency_index, a dependency that is completed already is satisfied
+        if mode == self.DEPENDENCY_ORDER:
+            offsets = table.dependency_offsets
+            remaining = array('q', (offsets[row + 1] - offsets[row] for row in range(len(table))))
+            dependent_offsets, dependent_rows = table.build_dependents()
+            if TaskTable.COMPLETED in statuses:
+                for row in range(len(table)):
+                    if statuses[row] == TaskTable.COMPLETED:
+                        for edge in range(dependent_offsets[row], dependent_offsets[row + 1]):
+                            remaining[dependent_rows[edge]] -= 1
+        
+        # the queue holds (priority, sequence, row) entries; like build_priority_queue, only rows that are
+        # not started or already queued are queued, so a table scheduled again does not run its rows twice
+        sequence = itertools.count()
+        queueable = (TaskTable.NOT_STARTED, TaskTable.IN_PRIORITY_QUEUE)
+        # rows queued by an earlier schedule that are not ready wait to be released again
+        if mode == self.DEPENDENCY_ORDER and TaskTable.IN_PRIORITY_QUEUE in statuses:
+            for row in range(len(table)):
+                if statuses[row] == TaskTable.IN_PRIORITY_QUEUE and remaining[row]:
+                    statuses[row] = TaskTable.NOT_STARTED
+        ready = [(priorities[row], next(sequence), row) for row in range(len(table))
+                 if statuses[row] in queueable and
+                 (mode == self.PRIORITY_ORDER or remaining[row] == 0)]
+        for priority, order, row in ready:
+            statuses[row] = TaskTable.IN_PRIORITY_QUEUE
+        # the number of rows in every status, counted afresh since the statuses may have been written
+        # directly, then moved along with the status codes
+        self.rebuild_status_index()
+        counters = self.table_status_counters()
+        priority_queue = MinHeap.from_iterable(ready)
+        
+        # run the function below while priority_queue has an unscheduled task
+        while priority_queue.size != 0:
+            priority, order, row = priority_queue.remove()
+            
+            start_time = current_time
+            current_time += durations[row]
+            # read the description once; a mapped task file decodes it on every read
+            description = descriptions[row]
+            yield ScheduleEvent(self.TASK_STARTED, ids[row], priority, description, start_time, current_time)
+            yield ScheduleEvent(self.TASK_COMPLETED, ids[row], priority, description, start_time, current_time)
+            
+            statuses[row] = TaskTable.COMPLETED
+            counters[TaskTable.IN_PRIORITY_QUEUE] -= 1
+            counters[TaskTable.COMPLETED] += 1
+            
+            # release the dependents whose last outstanding dependency was this row
+            if mode == self.DEPENDENCY_ORDER:
+                for edge in range(dependent_offsets[row], dependent_offsets[row + 1]):
+                    dependent = dependent_rows[edge]
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and statuses[dependent] == TaskTable.NOT_STARTED:
+                        priority_queue.insert((priorities[dependent], next(sequence), dependent))
+                        statuses[dependent] = TaskTable.IN_PRIORITY_QUEUE
+                        counters[TaskTable.NOT_STARTED] -= 1
+                        counters[TaskTable.IN_PRIORITY_QUEUE] += 1
+        
+        self.blocked = []
+        if mode == self.DEPENDENCY_ORDER:
+            self.blocked = [ids[row] for row in range(len(table))
+                            if remaining[row] > 0 and statuses[row] == TaskTable.NOT_STARTED]
+        self.makespan = self.busy_time = current_time - starting_time
+        self.utilisation = 1.0 if self.makespan else 0.0
+    
+    def print_schedule(self, events, starting_time = 480):
+        """
+        Prints a schedule to the console
+        Input: schedule events from iter_schedule and the starting time they were computed from
+        """
+        current_time = starting_time
+        stats = self.stats
+        report_seconds = 0.0
+        for event in events:
+            if stats is not None:
+                started = perf_counter()
+            if event.kind == self.TASK_STARTED:
+                print(f"⏰Simple Scheduler at time {self.format_time(event.start)} started executing task {event.task_id} that takes {event.end - event.start} mins")
+            else:
+                current_time = event.end
+                print(f"✅ Completed Task {event.task_id} with priority {event.priority} - '{event.description}' at time {self.format_time(current_time)}\n") 
+            if stats is not None:
+                report_seconds += perf_counter() - started
+            
+        total_time = current_time - starting_time             
+        print(f"🏁 Completed all planned tasks in {total_time//60}h{total_time%60:02d}min")
+        
+        # a parallel schedule also reports how busy its lanes were
+        if self.busy_time != self.makespan:
+            print(f"📊 Worked {self.busy_time//60}h{self.busy_time%60:02d}min in total, lane utilisation {self.utilisation:.0%}")
+        
+        if self.blocked:
+            print(f"⚠️ Could not schedule tasks {self.blocked}: their dependencies were never completed")
+        
+        if stats is not None:
+            self.phase_finished(self.REPORT_PHASE, report_seconds)
+    
+    def write_schedule(self, sink, starting_time = 480, mode = PRIORITY_ORDER, workers = 1, multitask = False):
+        """
+        Streams the schedule into a buffered sink
+        Input: a ScheduleSink and the arguments of iter_schedule
+        Output: number of records written
+        """
+        events = self.iter_schedule(starting_time, mode, workers, multitask)
+        if self.stats is None:
+            return sink.write_events(events)
+        
+        # time the sink separately from computing the events
+        report_seconds = 0.0
+        for event in events:
+            started = perf_counter()
+            sink.write(event)
+            report_seconds += perf_counter() - started
+        started = perf_counter()
+        sink.flush()
+        self.phase_finished(self.REPORT_PHASE, report_seconds + perf_counter() - started)
+        return sink.records
+    
+    def run_task_scheduler(self, starting_time = 480, mode = PRIORITY_ORDER, workers = 1, multitask = False):
+        """
+        Runs task scheduler and prints the schedule
+        Input: list of tasks, starting time of first task of the day, the scheduling mode (see
+        build_priority_queue), the number of lanes and whether tasks may only overlap when their
+        multitask ids allow it; a queue already prepared with build_priority_queue is used as it is
+        Output: task schedule
+        """
+        self.print_schedule(self.iter_schedule(starting_time, mode, workers, multitask), starting_time)
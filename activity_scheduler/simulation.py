@@ -0,0 +1,236 @@
+"""
+Monte Carlo simulation of uncertain task durations with NumPy
+"""
+
+from array import array
+from collections import namedtuple
+
+from .scheduler import TaskScheduler
+from .table import TaskTable
+
+SimulationResult = namedtuple("SimulationResult", ["task_ids", "makespans", "percentiles", "deadline_probability",
+                                                   "task_mean", "task_std", "task_percentiles"])
+SimulationResult.__doc__ = """
+The finish-time distributions of a simulation:
+- task_ids: ids of the simulated tasks, the order of the per-task arrays
+- makespans: the makespan of every scenario
+- percentiles: dictionary from a percentile to the makespan at it
+- deadline_probability: share of the scenarios finishing by the deadline, None without a deadline
+- task_mean, task_std: mean and standard deviation of the finish time of every task
+- task_percentiles: dictionary from a percentile to the finish time of every task at it, None unless asked
+  for; exact when all scenarios fit in one chunk, otherwise the mean of the percentiles of the chunks
+"""
+
+# how the simulation runs the tasks
+SERIAL = "serial"
+UNLIMITED = "unlimited"
+
+# duration distributions; every task's distribution is centred on its duration
+DISTRIBUTIONS = ("triangular", "uniform", "lognormal")
+
+
+def import_numpy():
+    """
+    Output: the numpy module, which is only needed for simulations
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("simulations need NumPy: pip install numpy") from None
+    return numpy
+
+
+def sample_durations(numpy, rng, durations, scenarios, distribution = "triangular", spread = 0.25, by_task = False):
+    """
+    Samples durations for a chunk of scenarios
+    Input: numpy, a numpy Generator, the durations of the tasks, the number of scenarios, the distribution
+    and its spread: triangular and uniform durations lie between duration * (1 - spread) and
+    duration * (1 + spread), with the duration as the mode for triangular; lognormal durations have
+    the duration as median and spread as the sigma of its logarithm
+    Output: an array of shape (scenarios, number of tasks), or (number of tasks, scenarios) when by_task
+    """
+    if by_task:
+        shape = (len(durations), scenarios)
+        durations = durations[:, None]
+    else:
+        shape = (scenarios, len(durations))
+    # every step works in place, since sampling is most of the cost of a simulation
+    if distribution == "lognormal":
+        factors = rng.standard_normal(shape)
+        factors *= spread
+        numpy.exp(factors, out=factors)
+    else:
+        # a uniform number in [-1, 1); the mean of two uniform numbers is triangular with its mode in the middle
+        factors = rng.random(shape)
+        if distribution == "triangular":
+            factors += rng.random(shape)
+        else:
+            factors *= 2
+        factors -= 1
+        factors *= spread
+        factors += 1
+    factors *= durations
+    return factors
+
+
+def serial_plan(scheduler, mode):
+    """
+    Schedules the tasks once to fix the order they run in on one lane, leaving their statuses as they were;
+    in the priority and dependency modes durations do not change that order, so every scenario runs the
+    same sequence. The critical-path modes order by remaining path lengths, which do depend on the
+    durations, so they are refused rather than simulated with the order of the planned durations
+    Input: the scheduler and the scheduling mode
+    Output: the ids and durations of the scheduled tasks in order
+    """
+    if mode in (TaskScheduler.CRITICAL_PATH_ORDER, TaskScheduler.PRIORITY_CRITICAL_PATH_ORDER):
+        raise ValueError(f"a serial simulation cannot follow the {mode!r} mode, whose order depends on the "
+                         "durations; use a priority or dependency mode, or run='unlimited'")
+    tasks = scheduler.tasks
+    if isinstance(tasks, TaskTable):
+        statuses = array('b', tasks.statuses)
+    else:
+        statuses = [task.status for task in tasks]
+    try:
+        events = [event for event in scheduler.iter_schedule(0, mode) if event.kind == TaskScheduler.TASK_COMPLETED]
+    finally:
+        if isinstance(tasks, TaskTable):
+            tasks.statuses[:] = statuses
+        else:
+            for task, status in zip(tasks, statuses):
+                task.status = status
+        scheduler.rebuild_status_index()
+    return [event.task_id for event in events], [event.end - event.start for event in events]
+
+
+def unlimited_plan(scheduler, numpy):
+    """
+    Groups the tasks by level in topological order, a task's level being one more than the deepest of its
+    dependencies, so all tasks of a level can be simulated together
+    Input: the scheduler
+    Output: the ids and durations in topological order, and for every level the positions of its tasks without
+    dependencies and, for every number of dependencies, the positions of the tasks with that many and a
+    matrix with the positions of their dependencies in its rows
+    """
+    if scheduler.tasks_by_id is None:
+        raise ValueError("unlimited simulations need a list of tasks, not a TaskTable")
+    order, dependents = scheduler.topological_order()
+    if len(order) != len(scheduler.tasks):
+        raise ValueError("the dependency graph has a cycle; see validate() for details")
+    position = {task.id: number for number, task in enumerate(order)}
+
+    # every level is a list of roots and a dictionary from a number of dependencies to the tasks with that many
+    levels = []
+    level_of = []
+    for task in order:
+        dependencies = list(dict.fromkeys(position[dependency] for dependency in task.dependencies
+                                          if dependency in position))
+        level = 1 + max((level_of[dependency] for dependency in dependencies), default=-1)
+        level_of.append(level)
+        if level == len(levels):
+            levels.append(([], {}))
+        roots, groups = levels[level]
+        if dependencies:
+            rows, matrix = groups.setdefault(len(dependencies), ([], []))
+            rows.append(position[task.id])
+            matrix.append(dependencies)
+        else:
+            roots.append(position[task.id])
+
+    levels = [(numpy.array(roots, dtype=numpy.intp),
+               [(numpy.array(rows, dtype=numpy.intp), numpy.array(matrix, dtype=numpy.intp))
+                for rows, matrix in groups.values()])
+              for roots, groups in levels]
+    return [task.id for task in order], [task.duration for task in order], levels
+
+
+def simulate(scheduler, scenarios = 10000, mode = TaskScheduler.DEPENDENCY_ORDER, run = SERIAL,
+             distribution = "triangular", spread = 0.25, sampler = None, percentiles = (50, 95), deadline = None,
+             starting_time = 0, seed = None, max_cells = 2 ** 24, task_percentiles = False):
+    """
+    Runs the plan in many scenarios at once, each with its own sampled durations, as arrays over a fixed order
+    Input:
+    - scheduler: a TaskScheduler; its tasks are left as they were
+    - scenarios: number of scenarios, at least 1
+    - mode: scheduling mode fixing the order of a SERIAL run, PRIORITY_ORDER or DEPENDENCY_ORDER (see
+      build_priority_queue); the critical-path modes are refused, since their order depends on the durations
+    - run: SERIAL runs the tasks one after another in the order the scheduler picks, UNLIMITED starts every
+      task as soon as its dependencies finish, as with unlimited lanes (see analyze_critical_path)
+    - distribution, spread: the duration distribution (see sample_durations)
+    - sampler: a function (rng, durations, scenarios) -> array of shape (scenarios, tasks) to sample the
+      durations with instead of distribution
+    - percentiles: the percentiles to report
+    - deadline: minutes after starting_time; the result gives the probability of finishing by it
+    - starting_time: the clock at the start of the plan, added to the finish times
+    - seed: seed of the random generator
+    - max_cells: the most durations held at once; scenarios are simulated in chunks of this many cells
+    - task_percentiles: also report the percentiles of every task's finish time, which costs about as much
+      as the rest of the simulation
+    Output: a SimulationResult
+    """
+    numpy = import_numpy()
+    if scenarios < 1:
+        raise ValueError(f"at least one scenario is needed, not {scenarios!r}")
+    if run not in (SERIAL, UNLIMITED):
+        raise ValueError(f"unknown run {run!r}")
+    if sampler is None and distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {distribution!r}")
+    if run == SERIAL:
+        task_ids, durations = serial_plan(scheduler, mode)
+    else:
+        task_ids, durations, levels = unlimited_plan(scheduler, numpy)
+    durations = numpy.asarray(durations, dtype=numpy.float64)
+    rng = numpy.random.default_rng(seed)
+    n = len(task_ids)
+
+    chunk = max(1, min(scenarios, max_cells // max(n, 1)))
+    makespans = numpy.empty(scenarios)
+    total = numpy.zeros(n)
+    total_squares = numpy.zeros(n)
+    chunk_percentiles = []
+    for first in range(0, scenarios, chunk):
+        count = min(chunk, scenarios - first)
+        # an unlimited run works with a row per task, so the dependencies of a level are gathered as whole rows
+        by_task = run == UNLIMITED
+        if sampler is not None:
+            sampled = numpy.asarray(sampler(rng, durations, count), dtype=numpy.float64)
+            if by_task:
+                sampled = numpy.ascontiguousarray(sampled.T)
+        else:
+            sampled = sample_durations(numpy, rng, durations, count, distribution, spread, by_task)
+
+        if run == SERIAL:
+            # one lane: every task finishes when all the tasks before it in the order are done
+            finish = numpy.cumsum(sampled, axis=1, out=sampled)
+        else:
+            # unlimited lanes, one level at a time: a task finishes its duration after its last dependency
+            finish = numpy.empty_like(sampled)
+            for roots, groups in levels:
+                finish[roots] = sampled[roots]
+                for rows, matrix in groups:
+                    latest = finish[matrix].max(axis=1)
+                    latest += sampled[rows]
+                    finish[rows] = latest
+        del sampled
+
+        # the axis over the scenarios of the chunk and the one over the tasks
+        scenario_axis, task_axis = (1, 0) if by_task else (0, 1)
+        makespans[first:first + count] = finish.max(axis=task_axis) if n else 0.0
+        total += finish.sum(axis=scenario_axis)
+        if task_percentiles:
+            chunk_percentiles.append(numpy.percentile(finish, percentiles, axis=scenario_axis)
+                                     if n else numpy.zeros((len(percentiles), 0)))
+        numpy.square(finish, out=finish)
+        total_squares += finish.sum(axis=scenario_axis)
+
+    mean = total / scenarios
+    std = numpy.sqrt(numpy.maximum(total_squares / scenarios - numpy.square(mean), 0.0))
+    if task_percentiles:
+        task_percentiles = dict(zip(percentiles, numpy.mean(chunk_percentiles, axis=0) + starting_time))
+    else:
+        task_percentiles = None
+    return SimulationResult(
+        task_ids, makespans,
+        dict(zip(percentiles, numpy.percentile(makespans, percentiles).tolist())),
+        None if deadline is None else float(numpy.mean(makespans <= deadline)),
+        mean + starting_time, std,
+        task_percentiles)
@@ -0,0 +1,163 @@
+"""
+Buffered writers of schedules to JSON Lines, CSV and binary files
+"""
+
+import csv
+import io
+import json
+import struct
+
+from .scheduler import TaskScheduler
+
+
+class ScheduleSink:
+    """
+    Base class of the buffered schedule sinks: one record per completed task is encoded into a buffer
+    and the buffer is written to the file with a single write call per batch
+    Input:
+    - file: a file object opened for writing (text for JSON Lines and CSV, binary for BinaryScheduleSink)
+    - batch_size: number of records buffered before they are written
+    - flush: flush policy; True flushes the file after every batch, False leaves it to the file object
+    """
+    # initialization
+    def __init__(self, file, batch_size = 8192, flush = False):
+        self.file = file
+        self.batch_size = batch_size
+        self.flush_file = flush
+        self.buffer = []
+        self.records = 0
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        
+    def encode(self, event):
+        """
+        Input: a TASK_COMPLETED schedule event
+        Output: the encoded record
+        """
+        raise NotImplementedError
+    
+    def write(self, event):
+        """
+        Buffers the record of a completed task; start events are skipped since completions carry both times
+        Input: a schedule event
+        """
+        if event.kind != TaskScheduler.TASK_COMPLETED:
+            return
+        self.buffer.append(self.encode(event))
+        self.records += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+            
+    def write_events(self, events):
+        """
+        Writes a stream of events, e.g. TaskScheduler.iter_schedule()
+        Input: schedule events
+        Output: number of records written in total
+        """
+        for event in events:
+            self.write(event)
+        self.flush()
+        return self.records
+    
+    def flush(self):
+        """
+        Writes the buffered records with one write call
+        """
+        if self.buffer:
+            self.file.write(self.join(self.buffer))
+            self.buffer = []
+        if self.flush_file:
+            self.file.flush()
+            
+    def join(self, records):
+        """
+        Input: encoded records
+        Output: one chunk to write
+        """
+        return "".join(records)
+    
+
+class JsonLinesScheduleSink(ScheduleSink):
+    """
+    Writes one JSON object per completed task and line: id, priority, description, start and end
+    """
+    def encode(self, event):
+        return json.dumps({"id": event.task_id, "priority": event.priority, "description": event.description,
+                           "start": event.start, "end": event.end}) + "\n"
+    
+
+class CsvScheduleSink(ScheduleSink):
+    """
+    Writes one CSV row per completed task after a header row: id, priority, description, start and end
+    """
+    HEADER = ("id", "priority", "description", "start", "end")
+    
+    # initialization
+    def __init__(self, file, batch_size = 8192, flush = False, header = True):
+        super().__init__(file, batch_size, flush)
+        # the csv writer formats rows into a string buffer that is written out per batch
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text, lineterminator="\n")
+        if header:
+            self.buffer.append(self.encode_row(self.HEADER))
+        
+    def encode_row(self, row):
+        self.writer.writerow(row)
+        line = self.text.getvalue()
+        self.text.seek(0)
+        self.text.truncate()
+        return line
+        
+    def encode(self, event):
+        return self.encode_row((event.task_id, event.priority, event.description, event.start, event.end))
+    
+
+class BinaryScheduleSink(ScheduleSink):
+    """
+    Writes fixed-width little-endian records after an 8-byte header (MAGIC, format version, description width):
+    id, priority, start and end as 64-bit integers, then the UTF-8 description truncated or
+    zero-padded to description_width bytes. Tasks with string ids (see TaskTable.from_records) cannot be
+    written and raise a ValueError
+    """
+    MAGIC = b"SCHD"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHH")
+    
+    # initialization
+    def __init__(self, file, batch_size = 8192, flush = False, description_width = 48):
+        super().__init__(file, batch_size, flush)
+        self.record = struct.Struct(f"<qqqq{description_width}s")
+        self.buffer.append(self.HEADER.pack(self.MAGIC, self.VERSION, description_width))
+        
+    def encode(self, event):
+        try:
+            return self.record.pack(event.task_id, event.priority, event.start, event.end,
+                                    event.description.encode("utf-8"))
+        except struct.error:
+            raise ValueError(f"binary schedule files only hold 64-bit integer ids, priorities and times, "
+                             f"not task {event.task_id!r}; use the JSON Lines or CSV sink") from None
+    
+    def join(self, records):
+        return b"".join(records)
+    
+    @classmethod
+    def read(cls, file):
+        """
+        Reads back a file written by BinaryScheduleSink
+        Input: a file object opened for reading in binary mode
+        Output: a generator of (id, priority, description, start, end) tuples
+        """
+        magic, version, description_width = cls.HEADER.unpack(file.read(cls.HEADER.size))
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("not a binary schedule file of a supported version")
+        record = struct.Struct(f"<qqqq{description_width}s")
+        while True:
+            chunk = file.read(record.size * 4096)
+            if not chunk:
+                return
+            for task_id, priority, start, end, description in record.iter_unpack(chunk):
+                yield task_id, priority, description.rstrip(b"\0").decode("utf-8", "ignore"), start, end
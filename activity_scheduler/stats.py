@@ -0,0 +1,67 @@
+"""
+Instrumentation of the scheduler: operation counters, phase timings and hooks
+"""
+
+
+class SchedulerStats:
+    """
+    Counters and phase timings collected by an instrumented TaskScheduler (see TaskScheduler.instrument):
+    - inserts, removes: entries that entered and left the ready queue, inserts including the ones loaded
+      at once when the queue is built
+    - sifts, swaps: sifts run in the heap and the levels entries moved during them; max_sift_depth is the deepest sift
+    - dependency_edges: dependent edges visited when tasks completed
+    - phase_seconds: wall-clock seconds per phase (build, order, execute, report)
+    """
+    # initialization
+    def __init__(self):
+        self.inserts = 0
+        self.removes = 0
+        self.sifts = 0
+        self.swaps = 0
+        self.max_sift_depth = 0
+        self.dependency_edges = 0
+        self.phase_seconds = {}
+        
+    def record_sift(self, start, end):
+        """
+        Records a sift from one heap position to another
+        Input: positions before and after the sift
+        """
+        depth = abs(end.bit_length() - start.bit_length())
+        self.sifts += 1
+        self.swaps += depth
+        if depth > self.max_sift_depth:
+            self.max_sift_depth = depth
+            
+    def add_phase_time(self, phase, seconds):
+        """
+        Input: name of the phase and the seconds spent in it
+        """
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+        
+    def as_dict(self):
+        """
+        Output: all the counters and timings as a dictionary
+        """
+        return {"inserts": self.inserts, "removes": self.removes, "sifts": self.sifts, "swaps": self.swaps,
+                "max_sift_depth": self.max_sift_depth, "dependency_edges": self.dependency_edges,
+                "phase_seconds": dict(self.phase_seconds)}
+    
+    def __repr__(self):
+        return f"SchedulerStats({self.as_dict()})"
+    
+
+class SchedulerHook:
+    """
+    Base class of the instrumentation hooks passed to TaskScheduler.instrument; subclasses override
+    the methods they need. Hooks are called once per phase, never per task
+    """
+    def phase_finished(self, phase, seconds, stats):
+        """
+        Input: name of the phase that just finished, the seconds it took and the SchedulerStats so far
+        """
+        
+    def schedule_finished(self, stats):
+        """
+        Input: the SchedulerStats once a schedule has been computed
+        """
@@ -0,0 +1,405 @@
+"""
+Columnar task tables, their loaders and the memory-mapped task file format
+"""
+
+import itertools
+import struct
+import sys
+from array import array
+
+from .task import Task
+
+
+class TaskTable:
+    """
+    A columnar store of tasks: one typed array per field instead of one Task object per task,
+    with the dependencies of every row kept as CSR offset and edge arrays of row numbers
+    Input:
+    - ids: integers, or any hashable ids such as strings, one per task
+    - priorities, durations: integers, one per task, stored with the narrowest typecode that holds them
+    - descriptions: list of descriptions, one per task
+    - dependency_offsets: n + 1 offsets; the dependencies of row i are dependency_rows[dependency_offsets[i]:dependency_offsets[i + 1]]
+    - dependency_rows: row numbers of the dependencies
+    - statuses: status codes (index into STATUSES), all not started by default
+    """
+    # status codes stored in the statuses array, in the order of STATUSES (the letters of TaskScheduler)
+    STATUSES = 'NICXPF'
+    NOT_STARTED = 0
+    IN_PRIORITY_QUEUE = 1
+    COMPLETED = 2
+    CANCELLED = 3
+    IN_PROGRESS = 4
+    FAILED = 5
+    
+    # initialization
+    def __init__(self, ids, priorities, descriptions, durations, dependency_offsets, dependency_rows, statuses = None):
+        # integer ids are packed into an array, other ids are kept in a list
+        try:
+            self.ids = array('q', ids)
+        except TypeError:
+            self.ids = list(ids)
+        # priorities and durations are small numbers in most plans, so they get the narrowest typecode that holds them
+        self.priorities = self.narrow_column(priorities)
+        self.descriptions = descriptions
+        self.durations = self.narrow_column(durations)
+        self.dependency_offsets = array('q', dependency_offsets)
+        self.dependency_rows = array('q', dependency_rows)
+        if statuses is None:
+            statuses = bytes(len(self.ids))
+        self.statuses = array('b', statuses)
+        
+        # the id -> row map is only built when a lookup by id is needed
+        self.rows = None
+        
+        # (task id, missing id) pairs of the dependencies on unknown ids the loaders left out,
+        # which TaskScheduler.validate reports
+        self.dangling = []
+    
+    @staticmethod
+    def narrow_column(values):
+        """
+        Packs integers into the narrowest typed array that holds all of them, e.g. one byte per
+        priority from 1 to 13 instead of eight
+        Input: an iterable of integers
+        Output: an array of typecode 'b', 'h', 'i' or 'q'
+        """
+        column = array('q', values)
+        if not column:
+            return column
+        low, high = min(column), max(column)
+        for typecode in ('b', 'h', 'i'):
+            limit = 2 ** (8 * array(typecode).itemsize - 1)
+            if -limit <= low and high < limit:
+                return array(typecode, column)
+        return column
+    
+    @staticmethod
+    def wide_column(column):
+        """
+        Input: an integer column, narrowed or not (mapped columns are memoryviews of 64-bit integers)
+        Output: the column as 64-bit integers, the column itself when it already is
+        """
+        if getattr(column, "typecode", 'q') == 'q':
+            return column
+        return array('q', column)
+    
+    @classmethod
+    def status_code(cls, status):
+        """
+        Input: a status letter of TaskScheduler
+        Output: its code in the statuses array
+        """
+        code = cls.STATUSES.find(status) if len(status) == 1 else -1
+        if code < 0:
+            raise ValueError(f"unknown task status {status!r}")
+        return code
+        
+    @classmethod
+    def from_tasks(cls, tasks):
+        """
+        Converts Task objects into a table
+        Input: list of tasks
+        Output: a TaskTable with the dependency ids rewritten to row numbers
+        """
+        rows = {task.id: row for row, task in enumerate(tasks)}
+        dependency_offsets = array('q', [0])
+        dependency_rows = array('q')
+        dangling = []
+        for task in tasks:
+            # a dependency on an unknown id can never be completed, so it is left out like in
+            # build_dependency_index and recorded for validate
+            for dependency in task.dependencies:
+                if dependency in rows:
+                    dependency_rows.append(rows[dependency])
+                else:
+                    dangling.append((task.id, dependency))
+            dependency_offsets.append(len(dependency_rows))
+        statuses = [cls.status_code(task.status) for task in tasks]
+        table = cls([task.id for task in tasks], [task.priority for task in tasks],
+                    [task.description for task in tasks], [task.duration for task in tasks],
+                    dependency_offsets, dependency_rows, statuses)
+        table.rows = rows
+        table.dangling = dangling
+        return table
+    
+    # fields of the records read by from_records, and the columns of the CSV and JSON Lines task feeds
+    RECORD_FIELDS = ("id", "priority", "description", "duration", "dependencies", "status")
+    
+    @classmethod
+    def from_records(cls, records, id_type = int, chunk_size = 65536):
+        """
+        Builds a table from a stream of task records, a chunk at a time, so only one chunk of parsed records
+        is held next to the columns; ids may be sparse or strings, since every id is mapped to its row
+        number once and the dependencies are rewritten to row numbers
+        Input:
+        - records: an iterable of (id, priority, description, duration, dependencies, status) tuples
+        - id_type: converts the ids and dependency ids, int by default; str keeps string ids
+        - chunk_size: number of records converted into the columns at a time
+        Output: a TaskTable; dependencies on unknown ids are left out and recorded like in from_tasks
+        """
+        integer_ids = id_type is int
+        ids = array('q') if integer_ids else []
+        priorities = array('q')
+        descriptions = []
+        durations = array('q')
+        statuses = array('b')
+        dependency_offsets = array('q', [0])
+        dependency_ids = array('q') if integer_ids else []
+        rows = {}
+        intern = sys.intern
+        
+        records = iter(records)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            
+            # convert the chunk column by column; repeated strings are interned so they are stored once
+            chunk_ids = [id_type(record[0]) if integer_ids else intern(id_type(record[0])) for record in chunk]
+            rows.update(zip(chunk_ids, range(len(ids), len(ids) + len(chunk))))
+            ids.extend(chunk_ids)
+            if len(rows) != len(ids):
+                raise ValueError("duplicate task ids in the records")
+            priorities.extend([int(record[1]) for record in chunk])
+            descriptions.extend([intern(record[2]) for record in chunk])
+            durations.extend([int(record[3]) for record in chunk])
+            statuses.extend([cls.status_code(record[5]) for record in chunk])
+            for record in chunk:
+                if integer_ids:
+                    dependency_ids.extend([int(dependency) for dependency in record[4]])
+                else:
+                    dependency_ids.extend([intern(id_type(dependency)) for dependency in record[4]])
+                dependency_offsets.append(len(dependency_ids))
+        
+        # rewrite the dependency ids to row numbers now that every id has a row, in one pass
+        # unless some dependencies are unknown and have to be left out row by row; the rows are packed
+        # straight from an iterator, so no Python list of every edge is built next to the array
+        dependency_rows = array('q', map(rows.get, dependency_ids, itertools.repeat(-1)))
+        dangling = []
+        if -1 in dependency_rows:
+            known = dependency_rows
+            dependency_rows = array('q')
+            offsets = array('q', [0])
+            for row in range(len(ids)):
+                for edge in range(dependency_offsets[row], dependency_offsets[row + 1]):
+                    if known[edge] == -1:
+                        dangling.append((ids[row], dependency_ids[edge]))
+                    else:
+                        dependency_rows.append(known[edge])
+                offsets.append(len(dependency_rows))
+            dependency_offsets = offsets
+        
+        table = cls(ids, priorities, descriptions, durations, dependency_offsets, dependency_rows, statuses)
+        table.rows = rows
+        table.dangling = dangling
+        return table
+    
+    @classmethod
+    def from_csv(cls, file, id_type = int, separator = ";", chunk_size = 65536):
+        """
+        Loads a CSV task feed with a header row naming the id, priority, description, duration and
+        dependencies columns, in any order, and optionally a status column
+        Input: a file object opened for reading text with newline="", the id type (see from_records),
+        the separator between the ids in the dependencies column and the chunk size
+        Output: a TaskTable
+        """
+        # the parsers are imported on first use so importing the package stays fast
+        import csv
+        reader = csv.reader(file)
+        header = next(reader, [])
+        missing = [name for name in cls.RECORD_FIELDS[:5] if name not in header]
+        if missing:
+            raise ValueError(f"the CSV header has no {', '.join(missing)} column")
+        task_id, priority, description, duration, dependencies = [header.index(name) for name in cls.RECORD_FIELDS[:5]]
+        status = header.index("status") if "status" in header else None
+        records = ((row[task_id], row[priority], row[description], row[duration],
+                    row[dependencies].split(separator) if row[dependencies] else (),
+                    row[status] if status is not None else "N")
+                   for row in reader if row)
+        return cls.from_records(records, id_type, chunk_size)
+    
+    @classmethod
+    def from_jsonl(cls, file, id_type = int, chunk_size = 65536):
+        """
+        Loads a JSON Lines task feed: one object per line with the keys id, priority, description,
+        duration and optionally dependencies (a list of ids) and status
+        Input: a text file object, the id type (see from_records) and the chunk size
+        Output: a TaskTable
+        """
+        import json
+        records = ((task["id"], task["priority"], task["description"], task["duration"],
+                    task.get("dependencies", ()), task.get("status", "N"))
+                   for task in (json.loads(line) for line in file if line.strip()))
+        return cls.from_records(records, id_type, chunk_size)
+        
+    def __len__(self):
+        return len(self.ids)
+    
+    def row(self, task_id):
+        """
+        Input: id of a task
+        Output: the row number of the task
+        """
+        if self.rows is None:
+            self.rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        return self.rows[task_id]
+    
+    def dependencies(self, row):
+        """
+        Input: row number of a task
+        Output: the row numbers of its dependencies
+        """
+        return self.dependency_rows[self.dependency_offsets[row]:self.dependency_offsets[row + 1]]
+    
+    def task(self, row):
+        """
+        Materialises one row as a Task, e.g. for reporting
+        Input: row number of a task
+        Output: a Task with the dependency rows translated back to ids
+        """
+        return Task(self.ids[row], self.priorities[row], self.descriptions[row], self.durations[row],
+                    [self.ids[dependency] for dependency in self.dependencies(row)],
+                    status=self.STATUSES[self.statuses[row]])
+    
+    def build_dependents(self):
+        """
+        Builds the reverse of the dependency arrays with a counting pass and a placement pass
+        Output: CSR offset and row arrays; the dependents of row i are
+        dependent_rows[dependent_offsets[i]:dependent_offsets[i + 1]]
+        """
+        n = len(self.ids)
+        dependent_offsets = array('q', bytes(8 * (n + 1)))
+        for dependency in self.dependency_rows:
+            dependent_offsets[dependency + 1] += 1
+        for row in range(n):
+            dependent_offsets[row + 1] += dependent_offsets[row]
+        
+        # place every edge at the next free slot of its dependency
+        next_slot = array('q', dependent_offsets[:n])
+        dependent_rows = array('q', bytes(8 * len(self.dependency_rows)))
+        offsets = self.dependency_offsets
+        for row in range(n):
+            for edge in range(offsets[row], offsets[row + 1]):
+                dependency = self.dependency_rows[edge]
+                dependent_rows[next_slot[dependency]] = row
+                next_slot[dependency] += 1
+        return dependent_offsets, dependent_rows
+    
+    # task files: a 32-byte little-endian header (magic, format version, flags, number of tasks n,
+    # number of dependency edges m, size s of the string table in bytes) followed by the sections
+    # ids[n], priorities[n], durations[n], dependency_offsets[n + 1], dependency_rows[m] and
+    # description_offsets[n + 1] as 64-bit integers, statuses[n] as status codes of one byte each
+    # and the UTF-8 descriptions, back to back, with description i at description_offsets[i]:description_offsets[i + 1]
+    FILE_MAGIC = b"TASK"
+    FILE_VERSION = 1
+    FILE_HEADER = struct.Struct("<4sHHqqq")
+    
+    def write(self, path):
+        """
+        Writes the table to a task file that open maps back without parsing; tables with dependencies
+        on unknown ids are refused, since the file has no room for them
+        Input: path of the task file
+        """
+        if isinstance(self.ids, list):
+            raise ValueError("task files only hold integer ids")
+        # a task file only holds resolved dependencies, so the ones on unknown ids would be lost silently
+        if self.dangling:
+            raise ValueError("the table has dependencies on unknown task ids; see TaskScheduler.validate")
+        descriptions = [description.encode("utf-8") for description in self.descriptions]
+        description_offsets = array('q', [0])
+        description_offsets.extend(itertools.accumulate(len(description) for description in descriptions))
+        columns = [self.ids, self.priorities, self.durations, self.dependency_offsets,
+                   self.dependency_rows, description_offsets]
+        # narrowed columns are widened back, since every integer section of the file is 64 bits
+        columns = [self.wide_column(column) for column in columns]
+        # the integer sections are stored little-endian like the header
+        if sys.byteorder == "big":
+            columns = [array('q', column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        with open(path, "wb") as file:
+            file.write(self.FILE_HEADER.pack(self.FILE_MAGIC, self.FILE_VERSION, 0, len(self.ids),
+                                             len(self.dependency_rows), description_offsets[-1]))
+            for column in columns:
+                file.write(column)
+            file.write(self.statuses)
+            for description in descriptions:
+                file.write(description)
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Maps a task file into memory; the columns are views of the mapped file, so opening takes the
+        same time whatever the size of the plan and pages are only read once they are used. The mapping
+        is copy-on-write: scheduling updates the statuses in memory, never in the file
+        Input: path of a task file written by write
+        Output: a TaskTable over the mapped file, for TaskScheduler
+        """
+        import mmap
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        header = cls.FILE_HEADER
+        if len(mapping) < header.size:
+            raise ValueError("not a task file of a supported version")
+        magic, version, flags, n, m, string_size = header.unpack_from(mapping)
+        if magic != cls.FILE_MAGIC or version != cls.FILE_VERSION:
+            raise ValueError("not a task file of a supported version")
+        if len(mapping) != header.size + 8 * (5 * n + m + 2) + n + string_size:
+            raise ValueError("the task file is truncated")
+        
+        # cut the sections out of the mapping without copying them
+        view = memoryview(mapping)
+        sections = []
+        offset = header.size
+        for count in (n, n, n, n + 1, m, n + 1):
+            sections.append(cls.mapped_column(view[offset:offset + 8 * count]))
+            offset += 8 * count
+        ids, priorities, durations, dependency_offsets, dependency_rows, description_offsets = sections
+        
+        table = cls.__new__(cls)
+        table.ids = ids
+        table.priorities = priorities
+        table.durations = durations
+        table.dependency_offsets = dependency_offsets
+        table.dependency_rows = dependency_rows
+        table.statuses = view[offset:offset + n].cast('b')
+        table.descriptions = StringTable(description_offsets, view[offset + n:])
+        table.rows = None
+        table.dangling = []
+        table.mapping = mapping
+        return table
+    
+    @staticmethod
+    def mapped_column(view):
+        """
+        Input: the bytes of a section of 64-bit little-endian integers
+        Output: the integers, as a view of the same memory where the byte order allows
+        """
+        if sys.byteorder == "little":
+            return view.cast('q')
+        column = array('q', bytes(view))
+        column.byteswap()
+        return column
+
+
+class StringTable:
+    """
+    The descriptions of a mapped task file, decoded one at a time when they are read
+    Input:
+    - offsets: n + 1 offsets; string i is data[offsets[i]:offsets[i + 1]]
+    - data: the UTF-8 strings back to back
+    """
+    # initialization
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+        
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, row):
+        return str(self.data[self.offsets[row]:self.offsets[row + 1]], "utf-8")
+    
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
@@ -0,0 +1,67 @@
+"""
+Tasks and the records produced when scheduling them
+"""
+
+from collections import namedtuple
+
+
+class Task:
+    """
+    A class that stores the input which is referred in TaskScheduler
+    Input:
+    - id: a unique task identifier (that can be referenced by other tasks)  
+    - priority: priority level of a task  
+    - description: a short description of the task
+    - duration: duration in minutes  
+    - dependencies: list of id’s indicating whether the current task cannot begin until all of its dependencies have been completed
+    - multitask: Indices of tasks that can be done together with the task
+    - status: the state of a task; possible values are not_yet_started, in_progress, or completed.      
+    """
+    # fixed attributes instead of a per-instance __dict__ keep large task lists small
+    __slots__ = ("id", "priority", "description", "duration", "dependencies", "multitask", "status")
+    
+    # initializes an instance of Task
+    def __init__(self,task_id,priority,description,duration,dependencies,multitask=(),status="N"):
+        self.id = task_id
+        self.priority = priority
+        self.description = description
+        self.duration = duration
+        self.dependencies = dependencies
+        self.multitask = multitask
+        self.status = status
+        
+    def __repr__(self):
+        return f"{self.description} - id: {self.id}\n\tPriority: {self.priority}\n\tDuration:{self.duration}\n\tDepends on: {self.dependencies}\n\tMultitask: {self.multitask}\n\tStatus: {self.status}"
+
+    def __lt__(self, other):
+        return self.id < other.id   
+    
+# result of TaskScheduler.analyze_critical_path: dictionaries from task id to earliest start, latest start,
+# slack and remaining path length, the ids along the critical path and the length of the plan
+CriticalPathAnalysis = namedtuple("CriticalPathAnalysis", ["earliest_start", "latest_start", "slack", "remaining",
+                                                           "critical_path", "length"])
+
+class ValidationReport(namedtuple("ValidationReport", ["cycles", "dangling_dependencies", "duplicate_ids",
+                                                       "dangling_multitask"])):
+    """
+    The problems found by TaskScheduler.validate
+    """
+    __slots__ = ()
+    
+    @property
+    def is_valid(self):
+        return not (self.cycles or self.dangling_dependencies or self.duplicate_ids or self.dangling_multitask)
+    
+    def errors(self):
+        """
+        Output: one message per problem
+        """
+        return ([f"dependency cycle: {' -> '.join(map(str, cycle + cycle[:1]))}" for cycle in self.cycles] +
+                [f"task {task_id} depends on unknown task {missing}" for task_id, missing in self.dangling_dependencies] +
+                [f"task id {task_id} is used more than once" for task_id in self.duplicate_ids] +
+                [f"task {task_id} can multitask with unknown task {missing}" for task_id, missing in self.dangling_multitask])
+
+# a schedule event: kind is TaskScheduler.TASK_STARTED or TASK_COMPLETED, start/end are the minutes the task runs
+# and lane is the worker it runs on (always 0 for a serial schedule)
+ScheduleEvent = namedtuple("ScheduleEvent", ["kind", "task_id", "priority", "description", "start", "end", "lane"],
+                           defaults=(0,))
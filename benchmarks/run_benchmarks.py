@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Benchmarks the scheduler on synthetic plans and compares the results with a stored baseline
+
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 --output bench_results.json
+    python benchmarks/run_benchmarks.py --baseline bench_results.json --output new_results.json
+
+Every case is timed on plans of every shape and size; with --memory the case is run a second time
+under tracemalloc to record its peak memory. Results are saved as JSON; with --baseline the run is
+compared case by case and the script exits with status 1 when a case got slower than --threshold;
+the baseline is read before anything runs and cannot be the --output file the run is saved to.
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# the repository root, where the activity_scheduler package lives
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def load_scheduler(root = ROOT):
+    """
+    Imports the scheduler package from the repository
+    Input: path of the repository root
+    Output: the package
+    """
+    sys.path.insert(0, os.path.abspath(root))
+    return importlib.import_module("activity_scheduler")
+
+
+# plan generators: each returns a list of Task objects with ids 0..n-1
+
+def chain_plan(scheduler, n, rng):
+    """
+    A single long chain: every task depends on the previous one
+    """
+    return [scheduler.Task(i, rng.randint(1, 13), f"chain {i}", rng.randint(1, 60), [i - 1] if i else [])
+            for i in range(n)]
+
+
+def fan_plan(scheduler, n, rng):
+    """
+    A wide fan-out/fan-in: one root, n - 2 tasks depending on it and a sink depending on all of them;
+    plans of fewer than 3 tasks have no room for a fan, so they are chains
+    """
+    if n < 3:
+        return chain_plan(scheduler, n, rng)
+    tasks = [scheduler.Task(0, 1, "root", 10, [])]
+    tasks.extend(scheduler.Task(i, rng.randint(1, 13), f"fan {i}", rng.randint(1, 60), [0]) for i in range(1, n - 1))
+    tasks.append(scheduler.Task(n - 1, 13, "sink", 10, list(range(1, n - 1))))
+    return tasks
+
+
+def random_plan(scheduler, n, rng, degree = 4, priorities = 13):
+    """
+    A random DAG: every task depends on up to 2 * degree earlier tasks, degree on average
+    """
+    tasks = []
+    for i in range(n):
+        dependencies = rng.sample(range(i), min(i, rng.randint(0, 2 * degree)))
+        tasks.append(scheduler.Task(i, rng.randint(1, priorities), f"task {i}", rng.randint(1, 60), dependencies))
+    return tasks
+
+
+def equal_priority_plan(scheduler, n, rng):
+    """
+    A random DAG where every task has the same priority, so only the tie-breaking orders it
+    """
+    return random_plan(scheduler, n, rng, priorities = 1)
+
+
+SHAPES = {
+    "chain": chain_plan,
+    "fan": fan_plan,
+    "random": random_plan,
+    "equal_priority": equal_priority_plan,
+}
+
+
+# benchmark cases: each takes the module and a fresh plan and does the measured work
+
+def heap_insert(scheduler, tasks):
+    heap = scheduler.MinHeap()
+    for sequence, task in enumerate(tasks):
+        heap.insert((task.priority, sequence, task))
+
+
+def heap_from_iterable_and_drain(scheduler, tasks):
+    heap = scheduler.MinHeap.from_iterable((task.priority, sequence, task) for sequence, task in enumerate(tasks))
+    while heap.size:
+        heap.remove()
+
+
+def dependency_index(scheduler, tasks):
+    scheduler.TaskScheduler(tasks).build_dependency_index()
+
+
+def dependency_schedule(scheduler, tasks):
+    for event in scheduler.TaskScheduler(tasks).iter_schedule(mode = scheduler.TaskScheduler.DEPENDENCY_ORDER):
+        pass
+
+
+def run_task_scheduler(scheduler, tasks):
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        scheduler.TaskScheduler(tasks).run_task_scheduler(mode = scheduler.TaskScheduler.DEPENDENCY_ORDER)
+
+
+CASES = {
+    "heap_insert": heap_insert,
+    "heap_from_iterable_and_drain": heap_from_iterable_and_drain,
+    "dependency_index": dependency_index,
+    "dependency_schedule": dependency_schedule,
+    "run_task_scheduler": run_task_scheduler,
+}
+
+
+def measure(scheduler, case, shape, size, seed, memory):
+    """
+    Times one case on a freshly generated plan, and optionally measures its peak memory on another one
+    Output: a result dictionary
+    """
+    tasks = SHAPES[shape](scheduler, size, random.Random(seed))
+    gc.collect()
+    start = time.perf_counter()
+    CASES[case](scheduler, tasks)
+    seconds = time.perf_counter() - start
+
+    peak_bytes = None
+    if memory:
+        tasks = SHAPES[shape](scheduler, size, random.Random(seed))
+        gc.collect()
+        tracemalloc.start()
+        CASES[case](scheduler, tasks)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"case": case, "shape": shape, "size": size, "seconds": seconds, "peak_bytes": peak_bytes}
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the ratio of every result to its baseline
+    Output: the results that are slower than threshold times their baseline
+    """
+    previous = {(result["case"], result["shape"], result["size"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["shape"], result["size"]))
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(result)
+            flag = "  <-- regression"
+        print(f"{result['case']:<30} {result['shape']:<15} {result['size']:>9} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the activity scheduler on synthetic plans")
+    parser.add_argument("--sizes", type = int, nargs = "+", default = [100, 1000, 10000],
+                        help = "plan sizes to run, e.g. 100 1000 10000 100000 1000000")
+    parser.add_argument("--shapes", nargs = "+", choices = sorted(SHAPES), default = sorted(SHAPES))
+    parser.add_argument("--cases", nargs = "+", choices = sorted(CASES), default = list(CASES))
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--memory", action = "store_true", help = "also record the peak memory of every case")
+    parser.add_argument("--output", default = "bench_results.json", help = "file the results are saved to")
+    parser.add_argument("--baseline", help = "results file of an earlier run to compare with")
+    parser.add_argument("--threshold", type = float, default = 1.25,
+                        help = "slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("plan sizes must be at least 1")
+
+    # read the baseline first, so a missing file fails before the run and the run cannot overwrite it
+    baseline = None
+    if args.baseline:
+        if os.path.abspath(args.baseline) == os.path.abspath(args.output):
+            parser.error("--output must not be the --baseline file, or the run would be compared with itself")
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    scheduler = load_scheduler()
+    results = []
+    for size in args.sizes:
+        for shape in args.shapes:
+            for case in args.cases:
+                result = measure(scheduler, case, shape, size, args.seed, args.memory)
+                results.append(result)
+                peak = f"{result['peak_bytes'] / 2**20:9.1f} MiB" if result["peak_bytes"] is not None else ""
+                print(f"{case:<30} {shape:<15} {size:>9} {result['seconds']:10.4f} s {peak}")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"python": sys.version, "results": results}, file, indent = 1)
+
+    if baseline is not None:
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+ScheduleCache: hits and misses, least recently used eviction, the disk tier and the state replayed on a hit
+"""
+
+import pytest
+
+from activity_scheduler import ScheduleCache, Task, TaskScheduler, TaskTable
+
+
+def plan(first_priority = 1, description = "task"):
+    return [Task(0, first_priority, f"{description} 0", 10, []), Task(1, 2, f"{description} 1", 20, [0]),
+            Task(2, 3, f"{description} 2", 30, [0, 1]), Task(3, 1, f"{description} 3", 5, [2])]
+
+
+def blocked_plan():
+    return plan() + [Task(4, 1, "blocked", 1, [5]), Task(5, 1, "cycle", 1, [4])]
+
+
+def test_a_plan_submitted_again_is_a_hit_with_the_same_events():
+    cache = ScheduleCache()
+    first = cache.schedule(TaskScheduler(plan()), 480, TaskScheduler.DEPENDENCY_ORDER)
+    again = cache.schedule(TaskScheduler(plan()), 480, TaskScheduler.DEPENDENCY_ORDER)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert again == first == tuple(TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER))
+    # any change to the plan or the arguments is another schedule
+    cache.schedule(TaskScheduler(plan(first_priority=5)), 480, TaskScheduler.DEPENDENCY_ORDER)
+    cache.schedule(TaskScheduler(plan()), 600, TaskScheduler.DEPENDENCY_ORDER)
+    assert (cache.misses, cache.hits) == (3, 1)
+
+
+@pytest.mark.parametrize("as_table", [False, True])
+def test_a_hit_replays_the_statuses_and_the_summary(as_table):
+    cache = ScheduleCache()
+    convert = TaskTable.from_tasks if as_table else list
+    computed = TaskScheduler(convert(blocked_plan()))
+    cache.schedule(computed, 480, TaskScheduler.DEPENDENCY_ORDER)
+    replayed = TaskScheduler(convert(blocked_plan()))
+    cache.schedule(replayed, 480, TaskScheduler.DEPENDENCY_ORDER)
+    assert cache.hits == 1
+    assert replayed.status_counts() == computed.status_counts()
+    assert replayed.count_status(TaskScheduler.COMPLETED) == 4
+    assert (sorted(replayed.blocked), replayed.makespan, replayed.busy_time, replayed.utilisation) == \
+        (sorted(computed.blocked), computed.makespan, computed.busy_time, computed.utilisation)
+
+
+def test_the_least_recently_used_schedule_is_evicted_first():
+    probe = ScheduleCache()
+    probe.schedule(TaskScheduler(plan()))
+    size = probe.bytes
+    cache = ScheduleCache(max_bytes = 2 * size + size // 2)
+    keys = []
+    for priority in (1, 2, 3):
+        tasks = plan(first_priority=priority)
+        keys.append(cache.key(tasks))
+        cache.schedule(TaskScheduler(tasks))
+        if priority == 2:
+            # touch the first schedule so the second one is now the least recently used
+            cache.schedule(TaskScheduler(plan(first_priority=1)))
+    assert list(cache.entries) == [keys[0], keys[2]]
+    assert cache.bytes == sum(entry[5] for entry in cache.entries.values()) <= cache.max_bytes
+
+
+def test_the_size_counts_the_descriptions():
+    short, long = ScheduleCache(), ScheduleCache()
+    short.schedule(TaskScheduler(plan(description="t")))
+    long.schedule(TaskScheduler(plan(description="t" * 10000)))
+    assert long.bytes - short.bytes >= 4 * 9999
+
+
+def test_schedules_evicted_from_memory_are_read_back_from_disk(tmp_path):
+    cache = ScheduleCache(directory = str(tmp_path))
+    events = cache.schedule(TaskScheduler(plan()), 480, TaskScheduler.DEPENDENCY_ORDER)
+    cache.clear()
+    replayed = TaskScheduler(plan())
+    assert cache.schedule(replayed, 480, TaskScheduler.DEPENDENCY_ORDER) == events
+    assert (cache.disk_hits, cache.misses) == (1, 1)
+    assert replayed.count_status(TaskScheduler.COMPLETED) == 4
+    # a new cache over the same directory finds it too
+    assert ScheduleCache(directory = str(tmp_path)).schedule(TaskScheduler(plan()), 480, TaskScheduler.DEPENDENCY_ORDER) == events
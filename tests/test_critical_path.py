@@ -0,0 +1,83 @@
+"""
+Critical path analysis against a brute-force walk over every path, and the order of the critical-path modes
+"""
+
+import random
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler
+
+
+def random_dag(count, seed):
+    rng = random.Random(seed)
+    return [Task(i, rng.randint(1, 5), f"task {i}", rng.randint(1, 20), rng.sample(range(i), min(i, rng.randint(0, 3))))
+            for i in range(count)]
+
+
+def longest_paths(tasks):
+    """
+    Output: for every task the longest path of durations ending just before it and the longest path starting
+    with it, found by walking every path of the graph
+    """
+    by_id = {task.id: task for task in tasks}
+    dependents = {task.id: [] for task in tasks}
+    for task in tasks:
+        for dependency in task.dependencies:
+            dependents[dependency].append(task.id)
+
+    def longest_before(task_id):
+        return max((longest_before(dependency) + by_id[dependency].duration for dependency in by_id[task_id].dependencies), default=0)
+
+    def longest_from(task_id):
+        return by_id[task_id].duration + max((longest_from(dependent) for dependent in dependents[task_id]), default=0)
+
+    return {task.id: longest_before(task.id) for task in tasks}, {task.id: longest_from(task.id) for task in tasks}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_analysis_matches_the_longest_paths(seed):
+    tasks = random_dag(random.Random(seed).randint(1, 12), seed)
+    analysis = TaskScheduler(tasks).analyze_critical_path()
+    earliest, remaining = longest_paths(tasks)
+    length = max(remaining.values())
+    assert analysis.earliest_start == earliest
+    assert analysis.remaining == remaining
+    assert analysis.length == length
+    assert analysis.latest_start == {task_id: length - path for task_id, path in remaining.items()}
+    assert analysis.slack == {task_id: length - remaining[task_id] - earliest[task_id] for task_id in earliest}
+
+    # the critical path runs back to back from the start to the end of the plan along dependencies
+    by_id = {task.id: task for task in tasks}
+    path = analysis.critical_path
+    assert earliest[path[0]] == 0
+    assert all(path[number] in by_id[path[number + 1]].dependencies for number in range(len(path) - 1))
+    assert sum(by_id[task_id].duration for task_id in path) == length
+    assert all(analysis.slack[task_id] == 0 for task_id in path)
+
+
+def test_a_cycle_is_refused():
+    tasks = [Task(0, 1, "a", 1, [1]), Task(1, 1, "b", 1, [0])]
+    with pytest.raises(ValueError, match="cycle"):
+        TaskScheduler(tasks).analyze_critical_path()
+    with pytest.raises(ValueError, match="cycle"):
+        TaskScheduler(tasks).build_priority_queue(TaskScheduler.CRITICAL_PATH_ORDER)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("mode", [TaskScheduler.CRITICAL_PATH_ORDER, TaskScheduler.PRIORITY_CRITICAL_PATH_ORDER])
+def test_every_start_is_the_best_ready_task(seed, mode):
+    tasks = random_dag(60, seed)
+    by_id = {task.id: task for task in tasks}
+    remaining = TaskScheduler(tasks).analyze_critical_path().remaining
+    if mode == TaskScheduler.CRITICAL_PATH_ORDER:
+        key = lambda task: (-remaining[task.id], task.priority)
+    else:
+        key = lambda task: (task.priority, -remaining[task.id])
+    completed = set()
+    for event in TaskScheduler(tasks).iter_schedule(0, mode):
+        if event.kind == TaskScheduler.TASK_COMPLETED:
+            completed.add(event.task_id)
+            continue
+        ready = [task for task in tasks if task.id not in completed and set(task.dependencies) <= completed]
+        assert key(by_id[event.task_id]) == min(key(task) for task in ready)
@@ -0,0 +1,75 @@
+"""
+The executors: results, failures cancelling their dependents, and fail_fast leaving every finished task recorded
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from activity_scheduler import AsyncTaskScheduler, ProcessTaskScheduler, Task, TaskScheduler
+
+
+def parallel_tasks():
+    return [Task(i, 1, f"task {i}", 1, []) for i in range(4)] + [Task(4, 1, "after the first", 1, [0])]
+
+
+async def fail_first(task):
+    if task.id == 0:
+        raise ValueError("first")
+    return task.id * 10
+
+
+def fail_first_id(task_id):
+    if task_id == 0:
+        raise ValueError("first")
+    return task_id * 10
+
+
+def fail_first_or_sleep(task_id):
+    if task_id == 0:
+        raise ValueError("first")
+    time.sleep(0.5)
+    return task_id * 10
+
+
+def test_async_failure_cancels_dependents():
+    tasks = parallel_tasks()
+    scheduler = AsyncTaskScheduler(tasks, fail_first)
+    assert asyncio.run(scheduler.run()) == {1: 10, 2: 20, 3: 30}
+    assert [task.status for task in tasks] == ["F", "C", "C", "C", "X"]
+    assert isinstance(scheduler.errors[0], ValueError)
+
+
+def test_async_fail_fast_records_the_other_finished_tasks():
+    tasks = parallel_tasks()
+    scheduler = AsyncTaskScheduler(tasks, fail_first)
+    with pytest.raises(ValueError, match="first"):
+        asyncio.run(scheduler.run(fail_fast=True))
+    assert [task.status for task in tasks] == ["F", "C", "C", "C", "X"]
+    assert scheduler.results == {1: 10, 2: 20, 3: 30}
+    assert scheduler.status_counts()[TaskScheduler.IN_PROGRESS] == 0
+
+
+@pytest.mark.parametrize("fail_fast", [False, True])
+def test_process_fail_fast_records_the_rest_of_the_batch(fail_fast):
+    tasks = parallel_tasks()
+    # one worker gets the four ready tasks as one batch, the failing one first
+    scheduler = ProcessTaskScheduler(tasks, fail_first_id, workers=1)
+    if fail_fast:
+        with pytest.raises(ValueError, match="first"):
+            scheduler.run(fail_fast=True)
+    else:
+        scheduler.run()
+    assert [task.status for task in tasks] == ["F", "C", "C", "C", "X"]
+    assert scheduler.results == {1: 10, 2: 20, 3: 30}
+    assert sorted(scheduler.measured) == [0, 1, 2, 3]
+
+
+def test_process_fail_fast_keeps_the_batches_that_were_running():
+    tasks = [Task(0, 1, "fails", 1, []), Task(1, 2, "slow", 1, [])]
+    scheduler = ProcessTaskScheduler(tasks, fail_first_or_sleep, workers=2, batch_size=1)
+    with pytest.raises(ValueError, match="first"):
+        scheduler.run(fail_fast=True)
+    assert [task.status for task in tasks] == ["F", "C"]
+    assert scheduler.results == {1: 10}
@@ -0,0 +1,89 @@
+"""
+The ready queues: every backend pops entries in (key, sequence) order, and the scheduler moves the
+entries of a BucketQueue to an IndexedMinHeap when a priority no longer fits it
+"""
+
+import random
+
+import pytest
+
+from activity_scheduler import BucketQueue, IndexedMinHeap, MinHeap, Task, TaskScheduler
+
+
+def random_entries(rng, count, priorities = 13):
+    return [(rng.randint(1, priorities), sequence, Task(sequence, 0, "task", 1, [])) for sequence in range(count)]
+
+
+def drain(queue):
+    entries = []
+    while queue.size:
+        entries.append(queue.remove())
+    return entries
+
+
+@pytest.mark.parametrize("backend", [MinHeap, IndexedMinHeap, BucketQueue])
+def test_queue_pops_in_sorted_order(backend):
+    rng = random.Random(0)
+    for count in (0, 1, 2, 17, 500):
+        entries = random_entries(rng, count)
+        queue = backend.from_iterable(entries[:count // 2])
+        for entry in entries[count // 2:]:
+            queue.insert(entry)
+        assert drain(queue) == sorted(entries, key=lambda entry: entry[:2])
+
+
+@pytest.mark.parametrize("backend", [IndexedMinHeap, BucketQueue])
+def test_update_and_cancel_keep_the_same_order(backend):
+    rng = random.Random(1)
+    entries = random_entries(rng, 300)
+    queue = backend.from_iterable(entries)
+    live = {entry[2].id: entry for entry in entries}
+    for task_id in rng.sample(sorted(live), 100):
+        if rng.random() < 0.5:
+            queue.cancel(task_id)
+            del live[task_id]
+        else:
+            priority, sequence, task = live[task_id]
+            live[task_id] = (rng.randint(1, 13), sequence, task)
+            queue.update_priority(task_id, live[task_id][0])
+    assert drain(queue) == sorted(live.values(), key=lambda entry: entry[:2])
+
+
+def test_bucket_queue_rejects_priorities_it_cannot_hold():
+    queue = BucketQueue.from_iterable(random_entries(random.Random(2), 10))
+    with pytest.raises(ValueError):
+        queue.insert((2.5, 10, Task(10, 2.5, "task", 1, [])))
+    with pytest.raises(ValueError):
+        queue.insert((10 ** 7, 11, Task(11, 10 ** 7, "task", 1, [])))
+    assert len(queue.buckets) < BucketQueue.MAX_RANGE
+    assert queue.size == 10
+
+
+def ten_tasks():
+    return [Task(i, i % 5 + 1, f"task {i}", 10, [i - 1] if i % 3 else []) for i in range(10)]
+
+
+@pytest.mark.parametrize("priority", [2.5, 10 ** 7])
+def test_scheduler_moves_to_a_heap_for_priorities_that_do_not_fit(priority):
+    expected_tasks = ten_tasks()
+    expected = TaskScheduler(expected_tasks, queue_backend=IndexedMinHeap)
+    expected.build_priority_queue(TaskScheduler.DEPENDENCY_ORDER)
+    expected.update_priority(3, priority)
+
+    scheduler = TaskScheduler(ten_tasks())
+    scheduler.build_priority_queue(TaskScheduler.DEPENDENCY_ORDER)
+    assert isinstance(scheduler.priority_queue, BucketQueue)
+    scheduler.update_priority(3, priority)
+    assert isinstance(scheduler.priority_queue, IndexedMinHeap)
+    assert list(scheduler.iter_schedule()) == list(expected.iter_schedule())
+
+
+def test_scheduler_moves_to_a_heap_for_added_tasks_that_do_not_fit():
+    scheduler = TaskScheduler(ten_tasks())
+    scheduler.build_priority_queue(TaskScheduler.DEPENDENCY_ORDER)
+    scheduler.add_task(Task(10, -10 ** 6, "urgent", 5, []))
+    scheduler.add_task(Task(11, 0.5, "fractional", 5, []))
+    assert isinstance(scheduler.priority_queue, IndexedMinHeap)
+    order = [event.task_id for event in scheduler.iter_schedule() if event.kind == TaskScheduler.TASK_STARTED]
+    assert order[:2] == [10, 11]
+    assert sorted(order) == list(range(12))
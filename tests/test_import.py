@@ -0,0 +1,64 @@
+"""
+Importing the package has to stay fast and free of side effects, since every worker process pays for it
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# cumulative import time allowed for the package, in microseconds, with its bytecode cached
+IMPORT_BUDGET = 50000
+
+# modules that must only be imported when the feature needing them is used
+LAZY_MODULES = ("asyncio", "concurrent.futures", "multiprocessing", "mmap", "threading", "hashlib", "numpy", "csv", "json")
+
+
+def run_python(code, *options):
+    """
+    Runs a snippet in a fresh interpreter from the repository root
+    Output: the completed process
+    """
+    environment = dict(os.environ)
+    # let the first run cache the bytecode, as it is once the package is installed
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run([sys.executable, *options, "-c", code], cwd=ROOT, env=environment,
+                          capture_output=True, text=True, check=True)
+
+
+def import_time():
+    """
+    Output: the cumulative import time of the package in microseconds, from python -X importtime
+    """
+    for line in run_python("import activity_scheduler", "-X", "importtime").stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "activity_scheduler":
+            return int(fields[1])
+    raise AssertionError("activity_scheduler missing from the -X importtime report")
+
+
+def test_import_is_fast():
+    run_python("import activity_scheduler")
+    assert min(import_time() for run in range(5)) < IMPORT_BUDGET
+
+
+def test_import_has_no_side_effects():
+    result = run_python("import sys, activity_scheduler\n"
+                        f"print([name for name in {LAZY_MODULES!r} if name in sys.modules])")
+    assert result.stdout == "[]\n"
+    assert result.stderr == ""
+
+
+def test_lazy_attributes_load_on_first_use():
+    result = run_python("import activity_scheduler\n"
+                        "print(activity_scheduler.AsyncTaskScheduler.__module__, activity_scheduler.ScheduleCache.__module__,\n"
+                        "      activity_scheduler.CsvScheduleSink.__module__)")
+    assert result.stdout.split() == ["activity_scheduler.executors", "activity_scheduler.cache", "activity_scheduler.sinks"]
+
+
+def test_one_definition_of_each_class():
+    import activity_scheduler
+    from activity_scheduler import demos
+    assert demos.Task is activity_scheduler.Task
+    assert demos.TaskScheduler is activity_scheduler.TaskScheduler
@@ -0,0 +1,50 @@
+"""
+Parallel schedules: lanes, multitask overlap rules and the same order from every queue backend
+"""
+
+import random
+
+import pytest
+
+from activity_scheduler import BucketQueue, IndexedMinHeap, Task, TaskScheduler
+
+
+def multitask_plan(count, seed):
+    rng = random.Random(seed)
+    return [Task(i, rng.randint(1, 13), f"task {i}", rng.randint(1, 60), rng.sample(range(max(0, i - 10), i), min(i, rng.randint(0, 2))),
+                 rng.sample(range(count), rng.randint(0, 4))) for i in range(count)]
+
+
+def overlapping(events):
+    """
+    Output: for every start event, the tasks running at that moment
+    """
+    ends = {event.task_id: event.end for event in events if event.kind == TaskScheduler.TASK_COMPLETED}
+    starts = [event for event in events if event.kind == TaskScheduler.TASK_STARTED]
+    for event in starts:
+        yield event, [other for other in starts if other is not event and other.start <= event.start < ends[other.task_id]]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_backends_give_the_same_multitask_schedule(seed):
+    schedules = []
+    for backend in (IndexedMinHeap, BucketQueue):
+        scheduler = TaskScheduler(multitask_plan(60, seed), queue_backend=backend)
+        schedules.append(list(scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER, workers=2, multitask=True)))
+    assert schedules[0] == schedules[1]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_multitask_schedule_respects_lanes_partners_and_dependencies(seed):
+    tasks = multitask_plan(80, seed)
+    by_id = {task.id: task for task in tasks}
+    scheduler = TaskScheduler(tasks)
+    events = list(scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER, workers=3, multitask=True))
+    ends = {event.task_id: event.end for event in events if event.kind == TaskScheduler.TASK_COMPLETED}
+    assert sorted(ends) == sorted(by_id)
+    for event, running in overlapping(events):
+        assert len(running) < 3
+        task = by_id[event.task_id]
+        for other in running:
+            assert other.task_id in task.multitask or task.id in by_id[other.task_id].multitask
+        assert all(ends[dependency] <= event.start for dependency in task.dependencies)
@@ -0,0 +1,61 @@
+"""
+Transitive reduction: the dependencies left imply the same ones, none of them is redundant and the schedule is unchanged
+"""
+
+import copy
+import random
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler
+
+
+def random_plan(count, seed):
+    rng = random.Random(seed)
+    tasks = [Task(i, rng.randint(1, 9), f"task {i}", rng.randint(1, 60), rng.sample(range(max(0, i - 20), i), min(i, rng.randint(0, 4))))
+             for i in range(count)]
+    rng.shuffle(tasks)
+    return tasks
+
+
+def ancestors(tasks):
+    """
+    Output: dictionary from every task id to the ids it depends on directly or through other tasks
+    """
+    by_id = {task.id: task for task in tasks}
+    found = {}
+    for task_id in sorted(by_id):
+        found[task_id] = set()
+        for dependency in by_id[task_id].dependencies:
+            found[task_id] |= {dependency} | found[dependency]
+    return found
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("seed", range(8))
+def test_reduction_keeps_the_closure_with_no_redundant_dependency(seed, block_size):
+    tasks = random_plan(200, seed)
+    reduced = copy.deepcopy(tasks)
+    edges = sum(len(task.dependencies) for task in tasks)
+    removed = TaskScheduler(reduced).transitive_reduction(block_size)
+    assert edges - removed == sum(len(task.dependencies) for task in reduced)
+    closure = ancestors(reduced)
+    assert closure == ancestors(tasks)
+    for task in reduced:
+        for dependency in task.dependencies:
+            assert all(dependency not in closure[other] for other in task.dependencies)
+
+
+@pytest.mark.parametrize("mode", [TaskScheduler.DEPENDENCY_ORDER, TaskScheduler.CRITICAL_PATH_ORDER])
+@pytest.mark.parametrize("seed", range(5))
+def test_reduction_leaves_the_schedule_unchanged(seed, mode):
+    tasks = random_plan(200, seed)
+    reduced = copy.deepcopy(tasks)
+    assert TaskScheduler(reduced).transitive_reduction() > 0
+    assert list(TaskScheduler(tasks).iter_schedule(480, mode)) == list(TaskScheduler(reduced).iter_schedule(480, mode))
+
+
+def test_completed_and_unknown_dependencies_are_left_alone():
+    tasks = [Task(0, 1, "done", 1, [], status=TaskScheduler.COMPLETED), Task(1, 1, "b", 1, [0]), Task(2, 1, "c", 1, [0, 1, 99])]
+    assert TaskScheduler(tasks).transitive_reduction() == 0
+    assert tasks[2].dependencies == [0, 1, 99]
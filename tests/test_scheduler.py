@@ -0,0 +1,80 @@
+"""
+The serial scheduler: dependency release, statuses carried in by the tasks and the TaskTable engine agreeing with it
+"""
+
+import itertools
+import random
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler, TaskTable
+
+
+def random_plan(count, seed, statuses = "N"):
+    rng = random.Random(seed)
+    return [Task(i, rng.randint(1, 9), f"task {i}", rng.randint(1, 60), rng.sample(range(max(0, i - 20), i), min(i, rng.randint(0, 3))),
+                 status=rng.choice(statuses)) for i in range(count)]
+
+
+def drain(scheduler):
+    order = []
+    task = scheduler.next_task()
+    while task is not None:
+        order.append(task.id)
+        scheduler.mark_completed(task.id)
+        task = scheduler.next_task()
+    return order
+
+
+def test_a_task_completed_early_is_not_handed_out_again():
+    scheduler = TaskScheduler([Task(0, 1, "a", 1, []), Task(1, 1, "b", 1, [0]), Task(2, 1, "c", 1, [1])])
+    scheduler.build_priority_queue(TaskScheduler.DEPENDENCY_ORDER)
+    scheduler.mark_completed(1)
+    assert drain(scheduler) == [0, 2]
+
+
+def test_tasks_in_progress_are_not_queued_when_their_dependencies_finish():
+    tasks = [Task(0, 1, "a", 1, []), Task(1, 1, "b", 1, [0], status=TaskScheduler.IN_PROGRESS), Task(2, 1, "c", 1, [1])]
+    scheduler = TaskScheduler(tasks)
+    scheduler.build_priority_queue(TaskScheduler.DEPENDENCY_ORDER)
+    assert drain(scheduler) == [0]
+    scheduler.mark_completed(1)
+    assert drain(scheduler) == [2]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("mode", [TaskScheduler.PRIORITY_ORDER, TaskScheduler.DEPENDENCY_ORDER])
+def test_table_engine_matches_task_objects(seed, mode):
+    objects = TaskScheduler(random_plan(100, seed, "NNNNNNCX"))
+    table = TaskScheduler(TaskTable.from_tasks(random_plan(100, seed, "NNNNNNCX")))
+    assert list(objects.iter_schedule(480, mode)) == list(table.iter_schedule(480, mode))
+    assert sorted(objects.blocked) == sorted(table.blocked)
+    assert list(objects.iter_schedule(480, mode)) == list(table.iter_schedule(480, mode)) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_status_index_matches_a_scan_of_the_tasks_during_a_schedule(seed):
+    tasks = random_plan(200, seed, "NNNNCIX")
+    scheduler = TaskScheduler(tasks)
+    for step, event in enumerate(scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER)):
+        if step % 25 == 0:
+            for status in TaskScheduler.STATUSES:
+                ids = [task.id for task in tasks if task.status == status]
+                assert sorted(scheduler.ids_with_status(status)) == ids
+                assert scheduler.count_status(status) == len(ids)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_a_schedule_closed_early_leaves_nothing_behind(workers):
+    tasks = random_plan(15, 3)
+    scheduler = TaskScheduler(tasks)
+    first = list(itertools.islice(scheduler.iter_schedule(480, TaskScheduler.PRIORITY_ORDER, workers), 3))
+    finished = {event.task_id for event in first if event.kind == TaskScheduler.TASK_COMPLETED}
+    assert TaskScheduler.IN_PROGRESS not in [task.status for task in tasks]
+    assert scheduler.priority_queue is None and scheduler.clock is None
+    events = list(scheduler.iter_schedule(600, TaskScheduler.DEPENDENCY_ORDER, workers))
+    assert scheduler.mode == TaskScheduler.DEPENDENCY_ORDER
+    assert min(event.start for event in events) == 600
+    assert sorted(event.task_id for event in events if event.kind == TaskScheduler.TASK_COMPLETED) == \
+        sorted(set(range(15)) - finished)
+    assert [task.status for task in tasks] == [TaskScheduler.COMPLETED] * 15
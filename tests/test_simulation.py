@@ -0,0 +1,35 @@
+"""
+Simulations: serial runs only follow modes whose order does not depend on the durations
+"""
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler
+
+numpy = pytest.importorskip("numpy")
+
+
+def plan():
+    return [Task(0, 1, "first", 10, []), Task(1, 2, "second", 20, [0]), Task(2, 3, "third", 30, [])]
+
+
+@pytest.mark.parametrize("mode", [TaskScheduler.CRITICAL_PATH_ORDER, TaskScheduler.PRIORITY_CRITICAL_PATH_ORDER])
+def test_serial_runs_refuse_the_critical_path_modes(mode):
+    with pytest.raises(ValueError, match="depends on the durations"):
+        TaskScheduler(plan()).simulate(10, mode)
+
+
+def test_serial_run_without_spread_gives_the_planned_makespan():
+    tasks = plan()
+    result = TaskScheduler(tasks).simulate(10, TaskScheduler.DEPENDENCY_ORDER, spread=0, seed=1)
+    events = TaskScheduler(plan()).iter_schedule(0, TaskScheduler.DEPENDENCY_ORDER)
+    assert result.task_ids == [event.task_id for event in events if event.kind == TaskScheduler.TASK_COMPLETED]
+    assert result.makespans.tolist() == [60.0] * 10
+    assert [task.status for task in tasks] == ["N"] * 3
+
+
+@pytest.mark.parametrize("scenarios", [0, -1])
+@pytest.mark.parametrize("run", ["serial", "unlimited"])
+def test_simulations_need_at_least_one_scenario(run, scenarios):
+    with pytest.raises(ValueError, match="at least one scenario"):
+        TaskScheduler(plan()).simulate(scenarios, run=run)
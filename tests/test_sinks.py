@@ -0,0 +1,90 @@
+"""
+Schedule sinks: every format reads back to the completed tasks, whatever the batch size
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from activity_scheduler import BinaryScheduleSink, CsvScheduleSink, JsonLinesScheduleSink, Task, TaskScheduler
+
+
+def plan():
+    return [Task(number, number % 3 + 1, f"task {number}, ünïcode", number + 1, [number - 1] if number else [])
+            for number in range(10)]
+
+
+def expected():
+    events = TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER)
+    return [(event.task_id, event.priority, event.description, event.start, event.end)
+            for event in events if event.kind == TaskScheduler.TASK_COMPLETED]
+
+
+class CountingFile(io.StringIO):
+    """
+    A text buffer counting the write calls
+    """
+    writes = 0
+    
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 8192])
+def test_json_lines_round_trip(batch_size):
+    file = CountingFile()
+    sink = JsonLinesScheduleSink(file, batch_size)
+    assert sink.write_events(TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER)) == 10
+    records = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert [(record["id"], record["priority"], record["description"], record["start"], record["end"])
+            for record in records] == expected()
+    # one write per full batch and one for the rest
+    assert file.writes == -(-10 // batch_size)
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 8192])
+def test_csv_round_trip(batch_size):
+    file = io.StringIO()
+    with CsvScheduleSink(file, batch_size) as sink:
+        for event in TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER):
+            sink.write(event)
+    rows = list(csv.reader(io.StringIO(file.getvalue())))
+    assert rows[0] == list(CsvScheduleSink.HEADER)
+    assert [(int(row[0]), int(row[1]), row[2], int(row[3]), int(row[4])) for row in rows[1:]] == expected()
+
+
+def test_the_buffer_is_written_only_when_a_batch_is_full():
+    file = io.StringIO()
+    sink = JsonLinesScheduleSink(file, batch_size = 4)
+    events = [event for event in TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER)
+              if event.kind == TaskScheduler.TASK_COMPLETED]
+    for event in events[:3]:
+        sink.write(event)
+    assert file.getvalue() == ""
+    sink.write(events[3])
+    assert len(file.getvalue().splitlines()) == 4
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, 8192])
+def test_binary_round_trip(batch_size):
+    file = io.BytesIO()
+    BinaryScheduleSink(file, batch_size, description_width = 64).write_events(
+        TaskScheduler(plan()).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER))
+    file.seek(0)
+    assert list(BinaryScheduleSink.read(file)) == expected()
+
+
+def test_binary_descriptions_are_cut_to_their_width():
+    file = io.BytesIO()
+    BinaryScheduleSink(file, description_width = 4).write_events(TaskScheduler(plan()).iter_schedule())
+    file.seek(0)
+    assert {record[2] for record in BinaryScheduleSink.read(file)} == {"task"}
+
+
+def test_binary_files_refuse_string_ids():
+    sink = BinaryScheduleSink(io.BytesIO())
+    with pytest.raises(ValueError, match="64-bit integer ids"):
+        sink.write_events(TaskScheduler([Task("a", 1, "named", 1, [])]).iter_schedule())
@@ -0,0 +1,82 @@
+"""
+Instrumentation: queue counters, dependency edges, phase timings and the hooks called once per phase
+"""
+
+import io
+import random
+
+import pytest
+
+from activity_scheduler import BucketQueue, IndexedMinHeap, JsonLinesScheduleSink, SchedulerHook, Task, TaskScheduler
+from activity_scheduler.demos import study_day_tasks
+
+
+def random_plan(count, seed):
+    rng = random.Random(seed)
+    return [Task(i, rng.randint(1, 9), f"task {i}", rng.randint(1, 60), rng.sample(range(i), min(i, rng.randint(0, 3))))
+            for i in range(count)]
+
+
+class RecordingHook(SchedulerHook):
+    """
+    Records the calls it gets
+    """
+    def __init__(self):
+        self.calls = []
+    
+    def phase_finished(self, phase, seconds, stats):
+        self.calls.append(phase)
+    
+    def schedule_finished(self, stats):
+        self.calls.append("schedule")
+
+
+@pytest.mark.parametrize("backend", [IndexedMinHeap, BucketQueue])
+@pytest.mark.parametrize("mode", [TaskScheduler.PRIORITY_ORDER, TaskScheduler.DEPENDENCY_ORDER])
+def test_every_task_is_counted_in_and_out_of_the_queue(mode, backend):
+    tasks = random_plan(200, 1)
+    scheduler = TaskScheduler(tasks, backend)
+    stats = scheduler.instrument()
+    for event in scheduler.iter_schedule(480, mode):
+        pass
+    assert stats.inserts == stats.removes == len(tasks)
+    edges = sum(len(task.dependencies) for task in tasks)
+    assert stats.dependency_edges == (0 if mode == TaskScheduler.PRIORITY_ORDER else edges)
+
+
+def test_the_demo_plan_counts_all_its_queued_tasks():
+    scheduler = TaskScheduler(study_day_tasks())
+    stats = scheduler.instrument()
+    for event in scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER):
+        pass
+    assert stats.inserts == stats.removes == 15
+    assert set(stats.as_dict()) == {"inserts", "removes", "sifts", "swaps", "max_sift_depth", "dependency_edges",
+                                    "phase_seconds"}
+
+
+def test_phases_are_timed_and_hooks_called_once_per_phase(capsys):
+    hook = RecordingHook()
+    scheduler = TaskScheduler(random_plan(50, 2))
+    stats = scheduler.instrument([hook])
+    scheduler.run_task_scheduler(480, TaskScheduler.DEPENDENCY_ORDER)
+    capsys.readouterr()
+    assert hook.calls == [TaskScheduler.BUILD_PHASE, TaskScheduler.ORDER_PHASE, TaskScheduler.EXECUTE_PHASE,
+                          "schedule", TaskScheduler.REPORT_PHASE]
+    assert set(stats.phase_seconds) == {TaskScheduler.BUILD_PHASE, TaskScheduler.ORDER_PHASE,
+                                        TaskScheduler.EXECUTE_PHASE, TaskScheduler.REPORT_PHASE}
+    assert all(seconds >= 0 for seconds in stats.phase_seconds.values())
+
+
+def test_writing_to_a_sink_is_timed_as_the_report_phase():
+    hook = RecordingHook()
+    scheduler = TaskScheduler(random_plan(50, 3))
+    scheduler.instrument([hook])
+    assert scheduler.write_schedule(JsonLinesScheduleSink(io.StringIO()), 480, TaskScheduler.DEPENDENCY_ORDER, workers=2) == 50
+    assert hook.calls[-1] == TaskScheduler.REPORT_PHASE and hook.calls.count("schedule") == 1
+
+
+def test_uninstrumented_schedulers_collect_nothing():
+    scheduler = TaskScheduler(random_plan(20, 4))
+    for event in scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER):
+        pass
+    assert scheduler.stats is None
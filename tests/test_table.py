@@ -0,0 +1,124 @@
+"""
+TaskTable: the columnar engine follows the statuses like the Task object path does, and task files and feeds load the same table
+"""
+
+import json
+import random
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler, TaskTable
+
+
+def small_plan():
+    return [Task(0, 1, "first", 10, []), Task(1, 2, "second", 20, [0]), Task(2, 3, "third", 30, [1])]
+
+
+@pytest.mark.parametrize("mode", [TaskScheduler.PRIORITY_ORDER, TaskScheduler.DEPENDENCY_ORDER])
+def test_table_scheduled_again_runs_nothing(mode):
+    scheduler = TaskScheduler(TaskTable.from_tasks(small_plan()))
+    assert len(list(scheduler.iter_schedule(480, mode))) == 6
+    assert list(scheduler.iter_schedule(480, mode)) == []
+
+
+def test_completed_rows_are_skipped_and_satisfy_their_dependents():
+    tasks = small_plan()
+    tasks[0].status = TaskScheduler.COMPLETED
+    scheduler = TaskScheduler(TaskTable.from_tasks(tasks))
+    events = list(scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER))
+    assert [event.task_id for event in events] == [1, 1, 2, 2]
+    assert scheduler.blocked == []
+
+
+def test_every_status_has_a_code():
+    tasks = [Task(number, 1, status, 1, [], status=status) for number, status in enumerate(TaskScheduler.STATUSES)]
+    table = TaskTable.from_tasks(tasks)
+    assert [table.task(row).status for row in range(len(table))] == list(TaskScheduler.STATUSES)
+    with pytest.raises(ValueError, match="unknown task status"):
+        TaskTable.from_tasks([Task(0, 1, "odd", 1, [], status="NI")])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_status_queries_match_a_scan_of_the_statuses_during_a_schedule(seed):
+    rng = random.Random(seed)
+    tasks = [Task(i, rng.randint(1, 9), f"task {i}", rng.randint(1, 9), rng.sample(range(max(0, i - 20), i), min(i, rng.randint(0, 3))),
+                  status=rng.choice("NNNNCIX")) for i in range(200)]
+    table = TaskTable.from_tasks(tasks)
+    scheduler = TaskScheduler(table)
+    for step, event in enumerate(scheduler.iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER)):
+        if step % 25 == 0:
+            counts = scheduler.status_counts()
+            for status in TaskScheduler.STATUSES:
+                ids = [table.ids[row] for row in range(len(table)) if TaskTable.STATUSES[table.statuses[row]] == status]
+                assert scheduler.ids_with_status(status) == ids
+                assert scheduler.count_status(status) == counts[status] == len(ids)
+    assert not scheduler.check_unscheduled_tasks() or scheduler.blocked
+
+
+def columns(table):
+    return ([table.ids[row] for row in range(len(table))], [table.priorities[row] for row in range(len(table))],
+            [table.descriptions[row] for row in range(len(table))], [table.durations[row] for row in range(len(table))],
+            [list(table.dependencies(row)) for row in range(len(table))], bytes(table.statuses))
+
+
+def test_task_file_round_trip(tmp_path):
+    tasks = small_plan() + [Task(3, 4, "fourth, with ünïcode", 40, [0, 2], status=TaskScheduler.COMPLETED)]
+    table = TaskTable.from_tasks(tasks)
+    path = str(tmp_path / "plan.task")
+    table.write(path)
+    opened = TaskTable.open(path)
+    assert columns(opened) == columns(table)
+    events = list(TaskScheduler(opened).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER))
+    assert events == list(TaskScheduler(table).iter_schedule(480, TaskScheduler.DEPENDENCY_ORDER))
+    # the mapping is copy-on-write, so the file still holds the statuses it was written with
+    assert columns(TaskTable.open(path)) == columns(TaskTable.from_tasks(tasks))
+
+
+def test_csv_and_json_lines_feeds_load_like_the_tasks(tmp_path):
+    tasks = small_plan() + [Task(3, 4, "fourth", 40, [0, 2], status=TaskScheduler.COMPLETED)]
+    csv_path = tmp_path / "plan.csv"
+    csv_path.write_text("description,id,priority,duration,dependencies,status\n" +
+                        "".join(f"\"{task.description}\",{task.id},{task.priority},{task.duration},"
+                                f"{';'.join(map(str, task.dependencies))},{task.status}\n" for task in tasks), encoding="utf-8")
+    jsonl_path = tmp_path / "plan.jsonl"
+    jsonl_path.write_text("".join(json.dumps({"id": task.id, "priority": task.priority, "description": task.description,
+                                              "duration": task.duration, "dependencies": task.dependencies,
+                                              "status": task.status}) + "\n" for task in tasks), encoding="utf-8")
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        from_csv = TaskTable.from_csv(file)
+    with open(jsonl_path, encoding="utf-8") as file:
+        from_jsonl = TaskTable.from_jsonl(file)
+    assert columns(from_csv) == columns(from_jsonl) == columns(TaskTable.from_tasks(tasks))
+
+
+def test_priorities_and_durations_use_the_narrowest_typecode(tmp_path):
+    table = TaskTable.from_tasks(small_plan())
+    assert (table.priorities.typecode, table.durations.typecode) == ('b', 'b')
+    assert TaskTable.narrow_column([-129, 0]).typecode == 'h'
+    assert TaskTable.narrow_column([0, 10**6]).typecode == 'i'
+    assert TaskTable.narrow_column([0, 2**40]).typecode == 'q'
+    # the task file still stores 64-bit sections, so wide and narrow columns survive the round trip
+    tasks = small_plan() + [Task(3, -5, "long", 2**40, [2])]
+    table = TaskTable.from_tasks(tasks)
+    path = str(tmp_path / "plan.task")
+    table.write(path)
+    assert columns(TaskTable.open(path)) == columns(table)
+
+
+@pytest.mark.parametrize("operation", [
+    lambda scheduler: scheduler.build_priority_queue(),
+    lambda scheduler: scheduler.next_task(),
+    lambda scheduler: scheduler.add_task(Task(9, 1, "new", 1, [])),
+    lambda scheduler: scheduler.mark_completed(0),
+    lambda scheduler: scheduler.update_priority(0, 5),
+    lambda scheduler: scheduler.cancel(0),
+    lambda scheduler: scheduler.analyze_critical_path(),
+    lambda scheduler: list(scheduler.iter_schedule(480, TaskScheduler.CRITICAL_PATH_ORDER)),
+    lambda scheduler: list(scheduler.iter_schedule(480, TaskScheduler.PRIORITY_CRITICAL_PATH_ORDER)),
+])
+def test_task_object_operations_on_a_table_raise_a_clear_error(operation):
+    scheduler = TaskScheduler(TaskTable.from_tasks(small_plan()))
+    with pytest.raises(ValueError, match="need Task objects, not a TaskTable"):
+        operation(scheduler)
+    with pytest.raises(ValueError, match="unknown scheduling mode"):
+        list(scheduler.iter_schedule(480, "no such mode"))
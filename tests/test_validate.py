@@ -0,0 +1,79 @@
+"""
+validate: cycles, self-loops, duplicate ids and dangling ids, for task lists and TaskTables alike
+"""
+
+import io
+
+import pytest
+
+from activity_scheduler import Task, TaskScheduler, TaskTable
+from activity_scheduler.__main__ import main
+
+
+def as_table(tasks):
+    return TaskTable.from_tasks(tasks)
+
+
+def as_list(tasks):
+    return tasks
+
+
+def rotate(cycle):
+    """
+    Output: the cycle starting at its smallest id, so cycles found from different tasks compare equal
+    """
+    start = cycle.index(min(cycle))
+    return cycle[start:] + cycle[:start]
+
+
+@pytest.mark.parametrize("convert", [as_list, as_table])
+def test_a_valid_plan_has_no_errors(convert):
+    report = TaskScheduler(convert([Task(0, 1, "a", 1, []), Task(1, 1, "b", 1, [0]), Task(2, 1, "c", 1, [0, 1])])).validate()
+    assert report.is_valid
+    assert report.errors() == []
+
+
+@pytest.mark.parametrize("convert", [as_list, as_table])
+def test_cycles_and_self_loops_are_reported(convert):
+    tasks = [Task(0, 1, "a", 1, [2]), Task(1, 1, "b", 1, [0]), Task(2, 1, "c", 1, [1]),
+             Task(3, 1, "loop", 1, [3]), Task(4, 1, "after the cycle", 1, [2])]
+    report = TaskScheduler(convert(tasks)).validate()
+    assert sorted(rotate(cycle) for cycle in report.cycles) == [[0, 2, 1], [3]]
+    assert not report.is_valid
+    assert "dependency cycle: 3 -> 3" in report.errors()
+
+
+@pytest.mark.parametrize("convert", [as_list, as_table])
+def test_dangling_dependencies_are_reported(convert):
+    report = TaskScheduler(convert([Task(0, 1, "a", 1, []), Task(1, 1, "b", 1, [0, 7, 8])])).validate()
+    assert report.dangling_dependencies == [(1, 7), (1, 8)]
+    assert report.errors() == ["task 1 depends on unknown task 7", "task 1 depends on unknown task 8"]
+
+
+@pytest.mark.parametrize("convert", [as_list, as_table])
+def test_duplicate_ids_are_reported(convert):
+    report = TaskScheduler(convert([Task(0, 1, "a", 1, []), Task(1, 1, "b", 1, [0]), Task(0, 1, "again", 1, [1])])).validate()
+    assert report.duplicate_ids == [0]
+    assert report.cycles == []
+
+
+def test_dangling_multitask_ids_are_reported():
+    report = TaskScheduler([Task(0, 1, "a", 1, [], [1, 5]), Task(1, 1, "b", 1, [], [0])]).validate()
+    assert report.dangling_multitask == [(0, 5)]
+    assert report.dangling_dependencies == []
+
+
+def test_feeds_record_the_dependencies_they_leave_out(tmp_path):
+    feed = io.StringIO("id,priority,description,duration,dependencies\n1,1,a,10,\n2,2,b,5,1;9\n")
+    table = TaskTable.from_csv(feed)
+    assert list(table.dependencies(1)) == [0]
+    assert TaskScheduler(table).validate().dangling_dependencies == [(2, 9)]
+    with pytest.raises(ValueError, match="unknown task ids"):
+        table.write(str(tmp_path / "plan.task"))
+
+
+def test_the_command_line_refuses_an_invalid_plan(tmp_path, capsys):
+    path = tmp_path / "plan.csv"
+    path.write_text("id,priority,description,duration,dependencies\n1,1,a,10,\n2,2,b,5,1;9\n", encoding="utf-8")
+    assert main([str(path)]) == 2
+    assert "task 2 depends on unknown task 9" in capsys.readouterr().err